@@ -0,0 +1,48 @@
+"""
+Measure cold import of zksync.config in a fresh interpreter
+
+    cd src && python -m benchmarks.config_import
+"""
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RUNS = 10
+
+SRC_PATH = Path(__file__).parent.parent
+
+SCRIPT = """
+import json, resource, time
+start = time.perf_counter()
+from zksync import config
+lazy = time.perf_counter() - start
+lazy_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+for value in vars(config).values():
+    if isinstance(value, config.LazyABI):
+        value.load()
+eager = lazy + time.perf_counter() - start
+print(json.dumps({"lazy": lazy, "eager": eager, "lazy_rss": lazy_rss, "eager_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+
+def measure() -> dict:
+    output = subprocess.run([sys.executable, "-c", SCRIPT], cwd=SRC_PATH, capture_output=True, check=True, text=True)
+
+    return json.loads(output.stdout)
+
+
+def main():
+    runs = [measure() for _ in range(RUNS)]
+
+    for key in ["lazy", "eager"]:
+        print(
+            f"{key}: import {statistics.median(run[key] for run in runs) * 1000:.2f} ms, "
+            f"max rss {statistics.median(run[key + '_rss'] for run in runs) / 1024:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
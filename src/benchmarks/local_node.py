@@ -0,0 +1,473 @@
+"""
+In-process stand-in for a zkSync Era JSON-RPC node
+
+    node = LocalNode(latency=0.01, error_rate=0.01, block_time=1)
+    url = await node.start()
+    set_endpoint_pool("zksync", [url])
+
+Blocks are produced deterministically: every block_time seconds (or on mine()) all pending
+transactions are included in arrival order. Signed raw transactions are decoded, nonces checked,
+ETH/ERC20 transfers and approvals applied and receipts with Approval/Transfer logs returned.
+eth_call emulates the ERC20 tokens from ZKSYNC_TOKENS, Multicall3, the SyncSwap classic factory
+and pools, the Pancake factory and quoter and the Mute and SpaceFi routers.
+"""
+import asyncio
+import random
+from typing import Callable, Dict, List, Tuple
+
+import rlp
+from aiohttp import web
+from eth_abi import decode, encode
+from eth_account import Account as EthereumAccount
+from eth_utils import function_abi_to_4byte_selector, keccak, to_checksum_address
+from web3._utils.abi import get_abi_input_types, get_abi_output_types
+
+from zksync.config import (
+    ERC20_ABI,
+    MULTICALL_ABI,
+    MULTICALL_CONTRACTS,
+    MUTE_CONTRACTS,
+    MUTE_ROUTER_ABI,
+    PANCAKE_CONTRACTS,
+    PANCAKE_FACTORY_ABI,
+    PANCAKE_QUOTER_ABI,
+    SPACEFI_CONTRACTS,
+    SPACEFI_ROUTER_ABI,
+    SYNCSWAP_CLASSIC_POOL_ABI,
+    SYNCSWAP_CLASSIC_POOL_DATA_ABI,
+    SYNCSWAP_CONTRACTS,
+    ZERO_ADDRESS,
+    ZKSYNC_TOKENS
+)
+from zksync.utils.amm import get_amount_out
+from .rpc_stub import RPCStub
+
+CHAIN_ID = 324
+
+APPROVAL_TOPIC = "0x" + keccak(text="Approval(address,address,uint256)").hex()
+TRANSFER_TOPIC = "0x" + keccak(text="Transfer(address,address,uint256)").hex()
+
+APPROVE_SELECTOR = keccak(text="approve(address,uint256)")[:4]
+TRANSFER_SELECTOR = keccak(text="transfer(address,uint256)")[:4]
+
+# USD prices used to seed pool reserves
+PRICES = {"ETH": 2000, "WETH": 2000, "USDC": 1, "USDT": 1, "BUSD": 1, "MATIC": 0.7, "OT": 0.2, "MAV": 0.3, "WBTC": 40000}
+DECIMALS = {"USDC": 6, "USDT": 6, "WBTC": 8}
+
+POOL_LIQUIDITY_USD = 10_000_000
+SYNCSWAP_FEE = 300  # 0.3% in 1e5 units
+PANCAKE_FEE = 50  # 0.05% in 1e5 units
+
+BASE_GAS = 21_000
+CALL_GAS = 150_000
+
+
+class RPCError(Exception):
+    def __init__(self, message: str, code: int = -32000) -> None:
+        self.code = code
+        super().__init__(message)
+
+
+def to_hex(value: int) -> str:
+    return hex(value)
+
+
+def to_int(value: bytes) -> int:
+    return int.from_bytes(value, "big")
+
+
+def pair_address(namespace: str, token_a: str, token_b: str, fee: int = 0) -> str:
+    token_a, token_b = sorted((token_a.lower(), token_b.lower()))
+
+    return to_checksum_address(keccak(text=f"{namespace}:{token_a}:{token_b}:{fee}")[-20:])
+
+
+class EmulatedContract:
+    """ABI-driven contract, handlers get decoded arguments and the call sender"""
+
+    def __init__(self, abi: list, handlers: Dict[str, Callable]) -> None:
+        self.functions: Dict[bytes, Tuple[list, list, Callable]] = {}
+
+        for item in abi:
+            if item.get("type") == "function" and item["name"] in handlers:
+                self.functions[function_abi_to_4byte_selector(item)] = (
+                    get_abi_input_types(item),
+                    get_abi_output_types(item),
+                    handlers[item["name"]]
+                )
+
+    def call(self, data: bytes, sender: str) -> bytes:
+        if data[:4] not in self.functions:
+            raise RPCError("execution reverted: unknown selector")
+
+        input_types, output_types, handler = self.functions[data[:4]]
+
+        result = handler(sender, *decode(input_types, data[4:]))
+
+        return encode(output_types, result if isinstance(result, tuple) else (result,))
+
+
+class LocalNode(RPCStub):
+    def __init__(
+            self,
+            latency: float = 0.0,
+            error_rate: float = 0.0,
+            block_time: float = 1.0,
+            seed: int = 0,
+            eth_balance: int = 10 * 10 ** 18,
+            token_balance: int = 1000
+    ) -> None:
+        super().__init__(handlers={}, latency=latency)
+
+        self.error_rate = error_rate
+        self.block_time = block_time
+        self.random = random.Random(seed)
+        self.eth_balance = eth_balance
+        self.token_balance = token_balance
+
+        self.block_number = 1
+        self.gas_price = 250_000_000
+        self.nonces: Dict[str, int] = {}
+        self.eth_balances: Dict[str, int] = {}
+        self.token_balances: Dict[Tuple[str, str], int] = {}
+        self.allowances: Dict[Tuple[str, str, str], int] = {}
+        self.mempool: List[Tuple[str, dict]] = []
+        self.receipts: Dict[str, dict] = {}
+        self.filters: Dict[str, int] = {}
+        self.miner = None
+
+        self.tokens = {}
+
+        for symbol, address in ZKSYNC_TOKENS.items():
+            address = to_checksum_address(address)
+            self.tokens.setdefault(address, ("WETH" if symbol == "ETH" else symbol, DECIMALS.get(symbol, 18)))
+
+        self.pools: Dict[str, Tuple[str, str, int, int]] = {}
+
+        for token_a in self.tokens:
+            for token_b in self.tokens:
+                if token_a < token_b:
+                    token0, token1 = sorted((token_a, token_b), key=str.lower)
+                    self.pools[pair_address("syncswap", token0, token1)] = (
+                        token0, token1, self.seed_reserve(token0), self.seed_reserve(token1)
+                    )
+
+        self.contracts: Dict[str, EmulatedContract] = {
+            to_checksum_address(MULTICALL_CONTRACTS["zksync"]): EmulatedContract(MULTICALL_ABI.load(), {
+                "aggregate3": self.aggregate3,
+                "getEthBalance": lambda sender, address: self.get_eth_balance(address),
+                "getBlockNumber": lambda sender: self.block_number,
+            }),
+            to_checksum_address(SYNCSWAP_CONTRACTS["classic_pool"]): EmulatedContract(SYNCSWAP_CLASSIC_POOL_ABI.load(), {
+                "getPool": lambda sender, token_a, token_b: self.get_syncswap_pool(token_a, token_b),
+            }),
+            to_checksum_address(PANCAKE_CONTRACTS["factory"]): EmulatedContract(PANCAKE_FACTORY_ABI.load(), {
+                "getPool": lambda sender, token_a, token_b, fee: pair_address("pancake", token_a, token_b, fee),
+            }),
+            to_checksum_address(PANCAKE_CONTRACTS["quoter"]): EmulatedContract(PANCAKE_QUOTER_ABI.load(), {
+                "quoteExactInputSingle": lambda sender, params: (
+                    self.quote(params[0], params[1], params[2], PANCAKE_FEE), 0, 1, CALL_GAS
+                ),
+            }),
+            to_checksum_address(MUTE_CONTRACTS["router"]): EmulatedContract(MUTE_ROUTER_ABI.load(), {
+                "getAmountOut": lambda sender, amount, token_in, token_out: (
+                    self.quote(token_in, token_out, amount, SYNCSWAP_FEE), False, SYNCSWAP_FEE
+                ),
+            }),
+            to_checksum_address(SPACEFI_CONTRACTS["router"]): EmulatedContract(SPACEFI_ROUTER_ABI.load(), {
+                "getAmountsOut": lambda sender, amount, path: [amount, self.quote(path[0], path[-1], amount, SYNCSWAP_FEE)],
+            }),
+        }
+
+        self.erc20 = EmulatedContract(ERC20_ABI, {
+            "balanceOf": lambda sender, owner: self.get_token_balance(self.call_target, owner),
+            "allowance": lambda sender, owner, spender: self.allowances.get(
+                (self.call_target, to_checksum_address(owner), to_checksum_address(spender)), 0
+            ),
+            "decimals": lambda sender: self.tokens[self.call_target][1],
+            "symbol": lambda sender: self.tokens[self.call_target][0],
+            "name": lambda sender: self.tokens[self.call_target][0],
+            "totalSupply": lambda sender: 10 ** 30,
+        })
+        self.pool = EmulatedContract(SYNCSWAP_CLASSIC_POOL_DATA_ABI.load(), {
+            "token0": lambda sender: self.pools[self.call_target][0],
+            "token1": lambda sender: self.pools[self.call_target][1],
+            "getReserves": lambda sender: self.pools[self.call_target][2:4],
+            "getSwapFee": lambda sender, *args: SYNCSWAP_FEE,
+            "getAmountOut": lambda sender, token_in, amount, _: self.pool_amount_out(self.call_target, token_in, amount),
+        })
+        self.call_target = None
+
+        self.handlers = {
+            "eth_chainId": lambda: to_hex(CHAIN_ID),
+            "net_version": lambda: str(CHAIN_ID),
+            "eth_gasPrice": lambda: to_hex(self.gas_price),
+            "eth_blockNumber": lambda: to_hex(self.block_number),
+            "eth_getBalance": lambda address, block="latest": to_hex(self.get_eth_balance(address)),
+            "eth_getTransactionCount": self.get_transaction_count,
+            "eth_call": self.eth_call,
+            "eth_estimateGas": self.estimate_gas,
+            "eth_sendRawTransaction": self.send_raw_transaction,
+            "eth_getTransactionReceipt": lambda tx_hash: self.receipts.get(tx_hash),
+            "eth_newBlockFilter": self.new_block_filter,
+            "eth_getFilterChanges": self.get_filter_changes,
+            "eth_uninstallFilter": lambda filter_id: self.filters.pop(filter_id, None) is not None,
+        }
+
+    # state
+
+    def seed_reserve(self, token: str) -> int:
+        symbol, decimals = self.tokens[token]
+
+        return int(POOL_LIQUIDITY_USD / PRICES.get(symbol, 1) * 10 ** decimals)
+
+    def get_eth_balance(self, address: str) -> int:
+        return self.eth_balances.setdefault(to_checksum_address(address), self.eth_balance)
+
+    def get_token_balance(self, token: str, owner: str) -> int:
+        key = (to_checksum_address(token), to_checksum_address(owner))
+
+        return self.token_balances.setdefault(key, self.token_balance * 10 ** self.tokens[key[0]][1])
+
+    def get_syncswap_pool(self, token_a: str, token_b: str) -> str:
+        pool = pair_address("syncswap", token_a, token_b)
+
+        return pool if pool in self.pools else ZERO_ADDRESS
+
+    def pool_amount_out(self, pool: str, token_in: str, amount: int) -> int:
+        token0, token1, reserve0, reserve1 = self.pools[pool]
+
+        if token_in.lower() == token0.lower():
+            return get_amount_out(amount, reserve0, reserve1, SYNCSWAP_FEE)
+
+        return get_amount_out(amount, reserve1, reserve0, SYNCSWAP_FEE)
+
+    def quote(self, token_in: str, token_out: str, amount: int, fee: int) -> int:
+        token_in, token_out = to_checksum_address(token_in), to_checksum_address(token_out)
+
+        if token_in not in self.tokens or token_out not in self.tokens:
+            raise RPCError("execution reverted: unknown token")
+
+        return get_amount_out(amount, self.seed_reserve(token_in), self.seed_reserve(token_out), fee)
+
+    # calls
+
+    def call(self, to: str, data: bytes, sender: str) -> bytes:
+        to = to_checksum_address(to)
+        self.call_target = to
+
+        if to in self.contracts:
+            return self.contracts[to].call(data, sender)
+        if to in self.tokens:
+            return self.erc20.call(data, sender)
+        if to in self.pools:
+            return self.pool.call(data, sender)
+
+        # Any other contract answers with an empty word
+        return b"\x00" * 32
+
+    def aggregate3(self, sender: str, calls: list) -> list:
+        results = []
+
+        for target, allow_failure, call_data in calls:
+            try:
+                results.append((True, self.call(target, call_data, sender)))
+            except RPCError:
+                if not allow_failure:
+                    raise
+                results.append((False, b""))
+
+        return results
+
+    def eth_call(self, transaction: dict, block: str = "latest") -> str:
+        data = bytes.fromhex(transaction.get("data", transaction.get("input", "0x"))[2:])
+
+        return "0x" + self.call(transaction["to"], data, transaction.get("from", ZERO_ADDRESS)).hex()
+
+    def gas_used(self, data: bytes) -> int:
+        return BASE_GAS + 16 * len(data) + (CALL_GAS if data else 0)
+
+    def estimate_gas(self, transaction: dict, block: str = "latest") -> str:
+        data = bytes.fromhex(transaction.get("data", "0x")[2:])
+
+        # zkSync estimates run well above gasUsed, Account scales them down by GAS_MULTIPLIER
+        return to_hex(int(self.gas_used(data) * 1.5))
+
+    def get_transaction_count(self, address: str, block: str = "latest") -> str:
+        address = to_checksum_address(address)
+        nonce = self.nonces.get(address, 0)
+
+        if block == "pending":
+            nonce += sum(1 for _, tx in self.mempool if tx["from"] == address)
+
+        return to_hex(nonce)
+
+    # transactions
+
+    def decode_transaction(self, raw: bytes) -> dict:
+        if raw[0] == 2:
+            fields = rlp.decode(raw[1:])
+            nonce, gas_price, gas, to, value, data = fields[1], fields[3], fields[4], fields[5], fields[6], fields[7]
+        elif raw[0] >= 0xc0:
+            nonce, gas_price, gas, to, value, data = rlp.decode(raw)[:6]
+        else:
+            raise RPCError(f"unsupported transaction type {raw[0]}")
+
+        return {
+            "from": EthereumAccount.recover_transaction(raw),
+            "to": to_checksum_address(to) if to else None,
+            "nonce": to_int(nonce),
+            "gasPrice": to_int(gas_price),
+            "gas": to_int(gas),
+            "value": to_int(value),
+            "data": data,
+        }
+
+    def send_raw_transaction(self, raw_transaction: str) -> str:
+        raw = bytes.fromhex(raw_transaction[2:])
+        tx = self.decode_transaction(raw)
+        tx_hash = "0x" + keccak(raw).hex()
+
+        if tx_hash in self.receipts or any(pending == tx_hash for pending, _ in self.mempool):
+            raise RPCError("already known")
+
+        expected = int(self.get_transaction_count(tx["from"], "pending"), 16)
+
+        if tx["nonce"] < expected:
+            raise RPCError(f"nonce too low: next nonce {expected}, tx nonce {tx['nonce']}")
+        if tx["nonce"] > expected:
+            raise RPCError(f"nonce too high: next nonce {expected}, tx nonce {tx['nonce']}")
+        if self.get_eth_balance(tx["from"]) < tx["value"] + tx["gas"] * tx["gasPrice"]:
+            raise RPCError("insufficient funds for gas * price + value")
+
+        self.mempool.append((tx_hash, tx))
+
+        return tx_hash
+
+    def execute(self, tx: dict) -> Tuple[int, List[dict]]:
+        logs = []
+        data, to, sender = tx["data"], tx["to"], tx["from"]
+
+        self.eth_balances[sender] = self.get_eth_balance(sender) - tx["value"]
+
+        if to is not None:
+            self.eth_balances[to] = self.get_eth_balance(to) + tx["value"]
+
+        if to in self.tokens and data[:4] == APPROVE_SELECTOR:
+            spender, amount = decode(["address", "uint256"], data[4:])
+            self.allowances[(to, sender, to_checksum_address(spender))] = amount
+            logs.append(self.log(to, APPROVAL_TOPIC, sender, spender, amount))
+        elif to in self.tokens and data[:4] == TRANSFER_SELECTOR:
+            recipient, amount = decode(["address", "uint256"], data[4:])
+
+            if self.get_token_balance(to, sender) < amount:
+                return 0, []
+
+            self.token_balances[(to, sender)] -= amount
+            self.token_balances[(to, to_checksum_address(recipient))] = self.get_token_balance(to, recipient) + amount
+            logs.append(self.log(to, TRANSFER_TOPIC, sender, recipient, amount))
+
+        return 1, logs
+
+    @staticmethod
+    def log(address: str, topic: str, first: str, second: str, amount: int) -> dict:
+        return {
+            "address": address,
+            "topics": [topic, "0x" + first.lower()[2:].rjust(64, "0"), "0x" + second.lower()[2:].rjust(64, "0")],
+            "data": "0x" + hex(amount)[2:].rjust(64, "0"),
+        }
+
+    def mine(self):
+        """Produce one block with every pending transaction"""
+        self.block_number += 1
+        block_hash = "0x" + keccak(text=f"block:{self.block_number}").hex()
+
+        for index, (tx_hash, tx) in enumerate(self.mempool):
+            gas_used = self.gas_used(tx["data"])
+
+            if tx["gas"] < gas_used:
+                status, logs, gas_used = 0, [], tx["gas"]
+            else:
+                status, logs = self.execute(tx)
+
+            self.nonces[tx["from"]] = tx["nonce"] + 1
+            self.eth_balances[tx["from"]] = self.get_eth_balance(tx["from"]) - gas_used * tx["gasPrice"]
+
+            self.receipts[tx_hash] = {
+                "transactionHash": tx_hash,
+                "transactionIndex": to_hex(index),
+                "blockHash": block_hash,
+                "blockNumber": to_hex(self.block_number),
+                "from": tx["from"],
+                "to": tx["to"],
+                "gasUsed": to_hex(gas_used),
+                "cumulativeGasUsed": to_hex(gas_used),
+                "effectiveGasPrice": to_hex(tx["gasPrice"]),
+                "contractAddress": None,
+                "logs": [
+                    {**log, "blockNumber": to_hex(self.block_number), "transactionHash": tx_hash, "logIndex": to_hex(i)}
+                    for i, log in enumerate(logs)
+                ],
+                "logsBloom": "0x" + "00" * 256,
+                "status": to_hex(status),
+                "type": "0x0",
+            }
+
+        self.mempool = []
+
+    def new_block_filter(self) -> str:
+        filter_id = to_hex(len(self.filters) + 1)
+        self.filters[filter_id] = self.block_number
+
+        return filter_id
+
+    def get_filter_changes(self, filter_id: str) -> list:
+        if filter_id not in self.filters:
+            raise RPCError("filter not found")
+
+        last, self.filters[filter_id] = self.filters[filter_id], self.block_number
+
+        return ["0x" + keccak(text=f"block:{number}").hex() for number in range(last + 1, self.block_number + 1)]
+
+    # transport
+
+    def dispatch(self, item: dict) -> dict:
+        method = item["method"]
+        self.calls[method] += 1
+
+        try:
+            if method not in self.handlers:
+                raise RPCError(f"the method {method} does not exist", -32601)
+            if self.error_rate and self.random.random() < self.error_rate:
+                raise RPCError("header not found")
+
+            return {"jsonrpc": "2.0", "id": item["id"], "result": self.handlers[method](*item.get("params", []))}
+        except RPCError as e:
+            return {"jsonrpc": "2.0", "id": item["id"], "error": {"code": e.code, "message": str(e)}}
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if self.error_rate and self.random.random() < self.error_rate / 2:
+            self.requests += 1
+            return web.Response(status=503, text="upstream unavailable")
+
+        return await super().handle(request)
+
+    async def produce_blocks(self):
+        while True:
+            await asyncio.sleep(self.block_time)
+            self.mine()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        url = await super().start(host, port)
+
+        if self.block_time:
+            self.miner = asyncio.create_task(self.produce_blocks())
+
+        return url
+
+    async def stop(self):
+        if self.miner is not None:
+            self.miner.cancel()
+
+        await super().stop()
+
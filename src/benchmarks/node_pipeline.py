@@ -0,0 +1,66 @@
+"""
+Throughput of zk_main -> module -> RPC against the local stand-in node
+
+    cd src && python -m benchmarks.node_pipeline [wallets] [latency] [error_rate]
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from eth_account import Account as EthereumAccount
+
+from zksync.main import zk_main
+from zksync.modules_settings import swap_syncswap
+from zksync.utils.clock import VirtualClock, set_clock
+from zksync.utils.endpoint_pool import set_endpoint_pool
+from zksync.utils.pool_registry import pool_registry
+from zksync.utils.providers import close_providers
+from .local_node import LocalNode
+
+
+async def main(wallets: int = 20, latency: float = 0.01, error_rate: float = 0.0):
+    node = LocalNode(latency=latency, error_rate=error_rate, block_time=0.5)
+    url = await node.start()
+
+    # Every chain the modules touch goes to the local node, gas checks included
+    for chain in ("zksync", "ethereum"):
+        set_endpoint_pool(chain, [url])
+
+    # Keep the fake pool addresses out of the real registry file
+    pool_registry.path = Path(tempfile.mkdtemp()) / "pools.json"
+
+    # Module sleeps run in simulated time, RPC latency stays real
+    clock = VirtualClock()
+    set_clock(clock)
+    advancer = asyncio.create_task(clock.auto_advance())
+
+    keys = [EthereumAccount.create().key.hex() for _ in range(wallets)]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        zk_main(swap_syncswap, SimpleNamespace(primary_key=key), {"max_amount": 0.01}, dry_run=False)
+        for key in keys
+    ], return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    advancer.cancel()
+
+    failed = [result for result in results if isinstance(result, Exception)]
+
+    print(f"wallets: {wallets}, rpc latency: {latency * 1000:.0f} ms, error rate: {error_rate:.0%}")
+    print(f"swaps: {wallets - len(failed)} ok, {len(failed)} failed in {elapsed:.2f} s ({wallets / elapsed:.1f} swaps/s)")
+    print(f"rpc requests: {node.requests}, blocks: {node.block_number}, receipts: {len(node.receipts)}")
+    print(f"rpc calls: {dict(node.calls)}")
+
+    for error in failed[:5]:
+        print(f"  {type(error).__name__}: {error}")
+
+    await close_providers()
+    await node.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(float(arg) if "." in arg else int(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,60 @@
+import asyncio
+from collections import Counter
+from typing import Callable, Dict
+
+from aiohttp import web
+
+
+class RPCStub:
+    """Local JSON-RPC server with a fixed per-request latency"""
+
+    def __init__(self, handlers: Dict[str, Callable], latency: float = 0.05) -> None:
+        self.handlers = handlers
+        self.latency = latency
+        self.requests = 0
+        self.calls = Counter()
+
+        self.runner = None
+
+    def dispatch(self, item: dict) -> dict:
+        method = item["method"]
+        self.calls[method] += 1
+
+        if method not in self.handlers:
+            return {"jsonrpc": "2.0", "id": item["id"], "error": {"code": -32601, "message": f"{method} not found"}}
+
+        return {"jsonrpc": "2.0", "id": item["id"], "result": self.handlers[method](*item.get("params", []))}
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+
+        await asyncio.sleep(self.latency)
+
+        payload = await request.json()
+
+        if isinstance(payload, list):
+            return web.json_response([self.dispatch(item) for item in payload])
+
+        return web.json_response(self.dispatch(payload))
+
+    def reset(self):
+        self.requests = 0
+        self.calls.clear()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_post("/", self.handle)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+
+        host, port = self.runner.addresses[0][:2]
+
+        return f"http://{host}:{port}/"
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
@@ -0,0 +1,79 @@
+"""
+Event loop lag while 1000 transactions are signed concurrently, inline vs the signer pool
+
+    cd src && python -m benchmarks.signing
+"""
+import asyncio
+import time
+
+from eth_account import Account as EthereumAccount
+
+from zksync.utils.signer import shutdown_signer, sign_transaction
+
+SIGNS = 1000
+TICK = 0.001
+
+
+def make_transaction(nonce: int) -> dict:
+    return {
+        "chainId": 324,
+        "from": ACCOUNT.address,
+        "to": ACCOUNT.address,
+        "value": 0,
+        "nonce": nonce,
+        "gas": 200_000,
+        "gasPrice": 250_000_000,
+        "data": "0x",
+    }
+
+
+ACCOUNT = EthereumAccount.create()
+
+
+async def measure_lag(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def run(sign) -> tuple:
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(measure_lag(stop, lags))
+
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[sign(make_transaction(nonce)) for nonce in range(SIGNS)])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+
+    lags.sort()
+
+    return elapsed, lags[int(len(lags) * 0.99) - 1 if len(lags) > 1 else 0], lags[-1]
+
+
+async def inline_sign(transaction: dict):
+    return EthereumAccount.sign_transaction(transaction, ACCOUNT.key)
+
+
+async def pool_sign(transaction: dict):
+    return await sign_transaction(transaction, ACCOUNT.key)
+
+
+async def main():
+    # Warm up the executor so worker start-up is not measured
+    await pool_sign(make_transaction(0))
+
+    for name, sign in (("inline", inline_sign), ("pool", pool_sign)):
+        elapsed, p99, worst = await run(sign)
+
+        print(f"{name:<7} {SIGNS} signs in {elapsed * 1000:.0f} ms, loop lag p99 {p99 * 1000:.1f} ms, max {worst * 1000:.1f} ms")
+
+    shutdown_signer()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
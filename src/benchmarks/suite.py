@@ -0,0 +1,232 @@
+"""
+Benchmarks of the production paths with machine-readable results to compare releases
+
+    cd src && python -m benchmarks.suite [--output results.json] [--rounds 20]
+
+Runs offline: the database is BENCH_DB_URL (in-memory SQLite by default, needs aiosqlite,
+or a local Postgres), the transaction pipeline talks to the local stand-in node.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from eth_account import Account as EthereumAccount
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from database.models import Base, CRUD, Action, ActionList, Client, Project, Route, Wallet
+from tasks import schedule_route
+from zksync.modules.account import Account
+from zksync.utils.endpoint_pool import set_endpoint_pool
+from zksync.utils.providers import close_providers
+from . import config_import
+from .local_node import LocalNode
+
+BENCH_DB_URL = os.getenv("BENCH_DB_URL", "sqlite+aiosqlite:///:memory:")
+
+ROUTE_SIZES = [5, 20, 50, 100]
+
+ACTION_NAMES = ["swap_syncswap", "swap_mute", "swap_spacefi", "swap_pancake", "mint_zkstars"]
+
+
+def summary(samples: List[float]) -> dict:
+    samples = sorted(samples)
+
+    return {
+        "runs": len(samples),
+        "min_ms": samples[0] * 1000,
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[max(int(len(samples) * 0.95) - 1, 0)] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+async def timed(func: Callable[[], Awaitable], rounds: int) -> dict:
+    samples = []
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+
+    return summary(samples)
+
+
+async def seed_route(crud: CRUD, client: Client, project: Project, size: int) -> Route:
+    # Project.route is one-to-one, the relationship would detach the routes seeded before
+    route = Route(route_name=f"bench-{size}", project_id=project.id)
+    action_lists = [ActionList(action_name=name, code=code) for code, name in enumerate(ACTION_NAMES)]
+    actions = [
+        Action(route=route, action_list=action_lists[i % len(action_lists)], pair="ETH/USDC")
+        for i in range(size)
+    ]
+
+    await crud.insert_data_many(route, *action_lists, *actions)
+
+    return route
+
+
+async def bench_scheduling(crud: CRUD, client: Client, wallet: Wallet, project: Project, rounds: int) -> dict:
+    results = {}
+
+    for size in ROUTE_SIZES:
+        route = await seed_route(crud, client, project, size)
+        action_list = await crud.get_actions(route.id)
+
+        # Jobs stay in the memory jobstore, the paused scheduler never runs them
+        scheduler = AsyncIOScheduler()
+        scheduler.start(paused=True)
+
+        async def schedule():
+            await schedule_route(
+                scheduler=scheduler,
+                crud=crud,
+                data={},
+                route=route,
+                project=project,
+                action_list=action_list,
+                client=client,
+                wallet=wallet,
+                min_time=1,
+                max_time=10,
+                max_amount=0.1,
+                gas=10
+            )
+
+        results[f"route_{size}"] = {"actions": len(action_list), **await timed(schedule, rounds)}
+
+        scheduler.shutdown(wait=False)
+
+    return results
+
+
+async def bench_crud(crud: CRUD, rounds: int) -> dict:
+    route_id = (await crud.get_project_routes("ZKSYNC"))[-1].id
+    tasks_list = await crud.get_all_active_tasks()
+
+    async def get_actions_cold():
+        crud.invalidate(Route)
+        await crud.get_actions(route_id)
+
+    async def update_statuses():
+        for task in tasks_list[:100]:
+            await crud.update_status_task(task.id, "WAIT")
+
+    return {
+        "active_tasks": len(tasks_list),
+        "get_actions_cold": await timed(get_actions_cold, rounds),
+        "get_actions_warm": await timed(lambda: crud.get_actions(route_id), rounds),
+        "get_all_active_tasks": await timed(crud.get_all_active_tasks, rounds),
+        "update_status_task_x100": await timed(update_statuses, max(rounds // 4, 1)),
+    }
+
+
+async def bench_tx_pipeline(rounds: int) -> dict:
+    node = LocalNode(latency=0.005, block_time=0.05)
+    url = await node.start()
+
+    set_endpoint_pool("zksync", [url])
+
+    account = Account(0, EthereumAccount.create().key.hex(), "zksync", None)
+    recipient = EthereumAccount.create().address
+
+    stages = {"get_tx_data": [], "sign": [], "send_raw_transaction": [], "wait_until_tx_finished": []}
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        tx = await account.get_tx_data(10 ** 12)
+        tx["to"] = recipient
+        stages["get_tx_data"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        signed_txn = await account.sign(tx)
+        stages["sign"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        txn_hash = await account.send_raw_transaction(signed_txn)
+        stages["send_raw_transaction"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await account.wait_until_tx_finished(txn_hash.hex())
+        stages["wait_until_tx_finished"].append(time.perf_counter() - start)
+
+    await close_providers()
+    await node.stop()
+
+    return {
+        "rpc_requests": node.requests,
+        "rpc_calls": dict(node.calls),
+        **{stage: summary(samples) for stage, samples in stages.items()},
+    }
+
+
+def bench_config_import(rounds: int) -> dict:
+    runs = [config_import.measure() for _ in range(rounds)]
+
+    return {
+        key: {
+            "median_ms": statistics.median(run[key] for run in runs) * 1000,
+            "max_rss_kb": statistics.median(run[key + "_rss"] for run in runs),
+        }
+        for key in ["lazy", "eager"]
+    }
+
+
+async def main(rounds: int) -> dict:
+    kwargs = {"poolclass": StaticPool} if BENCH_DB_URL.startswith("sqlite") else {}
+    engine = create_async_engine(BENCH_DB_URL, **kwargs)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    crud = CRUD(async_sessionmaker(engine, expire_on_commit=False))
+
+    client = Client(client_name="bench")
+    wallet = Wallet(primary_key="bench", evm_key="bench", wallet_name="bench", client=client)
+    project = Project(project_name="ZKSYNC")
+
+    await crud.insert_data_many(client, wallet, project)
+
+    results = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "database": engine.url.drivername,
+        "rounds": rounds,
+        "results": {
+            "config_import": bench_config_import(rounds),
+            "run_bot_scheduling": await bench_scheduling(crud, client, wallet, project, rounds),
+            "crud": await bench_crud(crud, rounds),
+            "tx_pipeline": await bench_tx_pipeline(rounds),
+        }
+    }
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+    await engine.dispose()
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", help="write the JSON results to a file instead of stdout")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(main(args.rounds)), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report)
+    else:
+        sys.stdout.write(report + "\n")
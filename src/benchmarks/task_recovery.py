@@ -0,0 +1,95 @@
+"""
+Recovery of pending tasks after a restart: one joined query against six lookups per task
+
+    cd src && BENCH_DB_URL=postgresql+asyncpg://... python -m benchmarks.task_recovery
+
+Without BENCH_DB_URL an in-memory SQLite database is used (needs aiosqlite).
+"""
+import asyncio
+import datetime
+import os
+import time
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from database.models import Base, CRUD, Action, ActionList, ActionWallet, Client, Project, Route, Wallet
+from tasks import run_action_tasks
+
+BENCH_DB_URL = os.getenv("BENCH_DB_URL", "sqlite+aiosqlite:///:memory:")
+
+TASKS = 10_000
+LEGACY_SAMPLE = 500
+
+
+async def seed(crud: CRUD, count: int):
+    client = Client(client_name="bench")
+    wallet = Wallet(primary_key="bench", evm_key="bench", wallet_name="bench", client=client)
+    project = Project(project_name="ZKSYNC")
+    route = Route(route_name="bench", project=project)
+    action = Action(route=route, action_list=ActionList(action_name="swap_syncswap", code=1), pair="ETH/USDC")
+
+    await crud.insert_data_many(client, wallet, project, route, action)
+
+    estimated_time = datetime.datetime.now() + datetime.timedelta(days=1)
+
+    await crud.create_route_tasks(
+        status="WAIT",
+        amount=0.01,
+        gas=10,
+        client_id=client.id,
+        wallet_id=wallet.id,
+        project_id=project.id,
+        route_id=route.id,
+        actions=[(action, estimated_time)] * count
+    )
+
+
+async def legacy_recovery(crud: CRUD, tasks_list: list):
+    for task in tasks_list:
+        await crud.get(task.client_id, Client)
+        await crud.get(task.wallet_id, Wallet)
+        await crud.get(task.project_id, Project)
+        await crud.get(task.route_id, Route)
+        await crud.get(task.action_id, Action)
+        await crud.get(task.action_wallet_id, ActionWallet)
+
+
+async def main():
+    kwargs = {"poolclass": StaticPool} if BENCH_DB_URL.startswith("sqlite") else {}
+    engine = create_async_engine(BENCH_DB_URL, **kwargs)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    crud = CRUD(async_sessionmaker(engine, expire_on_commit=False))
+    await seed(crud, TASKS)
+
+    start = time.perf_counter()
+    tasks_list = await crud.get_all_active_tasks()
+    await legacy_recovery(crud, tasks_list[:LEGACY_SAMPLE])
+    legacy_time = (time.perf_counter() - start) / LEGACY_SAMPLE * TASKS
+
+    scheduler = AsyncIOScheduler()
+    scheduler.start(paused=True)
+
+    start = time.perf_counter()
+    await run_action_tasks(scheduler, crud)
+    recovery_time = time.perf_counter() - start
+
+    print(f"pending tasks: {TASKS}, database: {engine.url.drivername}")
+    print(f"legacy lookups: {legacy_time:.2f} s (extrapolated from {LEGACY_SAMPLE} tasks)")
+    print(f"joined recovery: {recovery_time:.2f} s, {len(scheduler.get_jobs())} jobs scheduled")
+
+    scheduler.shutdown(wait=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""
+Compare Account.get_tx_data preparation against the old three sequential calls
+
+    cd src && python -m benchmarks.tx_data
+"""
+import asyncio
+import time
+
+from web3 import AsyncWeb3
+
+from zksync.utils.providers import PooledHTTPProvider, close_providers
+from zksync.utils.tx_params import get_tx_params
+from .rpc_stub import RPCStub
+
+ADDRESS = "0x1c7ff320ae4327784b464eed07714581643b36a7"
+
+ROUNDS = 20
+LATENCY = 0.05
+
+
+async def sequential_tx_params(w3: AsyncWeb3, address: str):
+    return await w3.eth.chain_id, await w3.eth.gas_price, await w3.eth.get_transaction_count(address)
+
+
+async def main():
+    stub = RPCStub(
+        handlers={
+            "eth_chainId": lambda: hex(324),
+            "eth_gasPrice": lambda: hex(250_000_000),
+            "eth_getTransactionCount": lambda address, block: hex(7),
+        },
+        latency=LATENCY
+    )
+    url = await stub.start()
+
+    address = AsyncWeb3.to_checksum_address(ADDRESS)
+
+    w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await sequential_tx_params(w3, address)
+    sequential_time, sequential_requests = time.perf_counter() - start, stub.requests
+
+    stub.reset()
+
+    w3 = AsyncWeb3(PooledHTTPProvider(url))
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await get_tx_params(w3, "benchmark", address)
+    batched_time, batched_requests = time.perf_counter() - start, stub.requests
+
+    print(f"rounds: {ROUNDS}, stub latency: {LATENCY * 1000:.0f} ms")
+    print(f"sequential: {sequential_requests / ROUNDS:.2f} requests/tx, {sequential_time / ROUNDS * 1000:.1f} ms/tx")
+    print(f"batched:    {batched_requests / ROUNDS:.2f} requests/tx, {batched_time / ROUNDS * 1000:.1f} ms/tx")
+
+    await close_providers()
+    await stub.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
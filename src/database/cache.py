@@ -0,0 +1,30 @@
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class ReadCache:
+    """
+    In-process read-through cache for rarely changing tables.
+    Writes through CRUD clear it, the ttl bounds staleness between gunicorn workers.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        cached = self.data.get(key)
+
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        value = await loader()
+        self.data[key] = (time.monotonic(), value)
+
+        return value
+
+    def invalidate(self):
+        self.data.clear()
+
+
+route_cache = ReadCache(ttl=60)
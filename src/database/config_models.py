@@ -20,5 +20,8 @@ url = f'postgresql+asyncpg://{DB_LOGIN}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NA
 
 engine = create_async_engine(url=url, echo=True)
 
+# Синхронный движок на тех же настройках, нужен хранилищу задач APScheduler
+sync_engine = create_engine(url=engine.url.set(drivername="postgresql+psycopg2"), pool_size=2, max_overflow=2)
+
 session = sessionmaker(engine)
 Base = declarative_base()
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class ActionListDTO:
+    id: int
+    action_name: str
+    code: int
+
+
+@dataclass(frozen=True)
+class ActionDTO:
+    id: int
+    route_id: int
+    action_list_id: int
+    pair: str
+
+
+@dataclass(frozen=True)
+class RouteDTO:
+    id: int
+    route_name: str
+    project_id: int
+    actions: Tuple[ActionDTO, ...]
@@ -5,14 +5,16 @@ import asyncio
 
 from typing import List, Tuple
 from loguru import logger
-from sqlalchemy import ForeignKey, TIMESTAMP, select, update, delete
-from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
+from sqlalchemy import ForeignKey, TIMESTAMP, select, insert, update, delete
+from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload, joinedload
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from .cache import route_cache
 from .config_models import engine
+from .dto import ActionDTO, ActionListDTO, RouteDTO
 
 # alembic stamp head
 # gunicorn -w 4 -k uvicorn.workers.UvicornWorker -b 0.0.0.0:8000 run:app
@@ -139,6 +141,8 @@ class Tasks(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     created_at: Mapped[datetime.datetime] = mapped_column(TIMESTAMP, default=datetime.datetime.now)
     status: Mapped[str]
+    job_id: Mapped[str] = mapped_column(nullable=True, index=True)
+    claimed_at: Mapped[datetime.datetime] = mapped_column(TIMESTAMP, nullable=True)
 
     client_id: Mapped[int] = mapped_column(ForeignKey("client.id"), nullable=True)
     wallet_id: Mapped[int] = mapped_column(ForeignKey("wallet.id"), nullable=True)
@@ -155,6 +159,10 @@ class Tasks(Base):
     action_wallet: Mapped['ActionWallet'] = relationship(backref="task")
 
 
+# Таблицы, которые кешируются в route_cache
+ROUTE_TABLES = (Project, Route, Action, ActionList)
+
+
 class CRUD():
     def __init__(self, session = None) -> None:
         if not session:
@@ -173,13 +181,19 @@ class CRUD():
             async with engine.begin() as conn:
                 await conn.run_sync(Base.metadata.drop_all)
 
+    def invalidate(self, *obj):
+        if any(item in ROUTE_TABLES or isinstance(item, ROUTE_TABLES) for item in obj):
+            route_cache.invalidate()
+
     async def insert_data(self, obj, **kwargs):
         async with self.session() as session:
             session.add(obj)
             await session.commit()
             await session.refresh(obj)
 
-            return obj
+        self.invalidate(obj)
+
+        return obj
     
     async def flust_data(self, obj):
         async with self.session() as session:
@@ -195,7 +209,9 @@ class CRUD():
             session.add_all(obj)
             await session.commit()
 
-            return obj
+        self.invalidate(*obj)
+
+        return obj
         
     async def create_tasks(
             self,
@@ -284,6 +300,56 @@ class CRUD():
         return action_wallet
     
 
+    async def create_route_tasks(
+            self,
+            status: str,
+            amount: float,
+            gas: int,
+            client_id: int,
+            wallet_id: int,
+            project_id: int,
+            route_id: int,
+            actions: List[Tuple[Action, datetime.datetime]],
+            job_id: str = None
+        ) -> List[Tuple[ActionWallet, Tasks]]:
+        """Create action_wallet and tasks rows for the whole route in one transaction"""
+
+        async with self.session() as session:
+            async with session.begin():
+                action_wallets = await session.scalars(
+                    insert(ActionWallet).returning(ActionWallet, sort_by_parameter_order=True),
+                    [
+                        {
+                            "status": status,
+                            "amount": amount,
+                            "gas": gas,
+                            "action_id": action.id,
+                            "wallet_id": wallet_id,
+                            "estimated_time": estimated_time
+                        } for action, estimated_time in actions
+                    ]
+                )
+                action_wallets = action_wallets.all()
+
+                tasks = await session.scalars(
+                    insert(Tasks).returning(Tasks, sort_by_parameter_order=True),
+                    [
+                        {
+                            "status": status,
+                            "job_id": job_id,
+                            "client_id": client_id,
+                            "wallet_id": wallet_id,
+                            "project_id": project_id,
+                            "route_id": route_id,
+                            "action_id": action_wallet.action_id,
+                            "action_wallet_id": action_wallet.id
+                        } for action_wallet in action_wallets
+                    ]
+                )
+                tasks = tasks.all()
+
+            return list(zip(action_wallets, tasks))
+
     async def create_client_wallet(self, client_name, private_key) -> Tuple[Client, Wallet]:
         client = await self.create_client(client_name)
         wallet = await self.create_wallet(private_key, client)
@@ -316,22 +382,53 @@ class CRUD():
 
         return result
 
-    async def get_actions(self, route_id) -> List[ActionList]:
-        async with self.session() as session:
-            actions_list = []
-            raw_sql = select(Route).options(selectinload(Route.action)).where(Route.id == route_id)
-            route = await session.scalars(raw_sql)
-            route = route.first()
-            logger.error(route.action)
-
-            for item in route.action:
-                raw_action = select(ActionList).where(ActionList.id == item.action_list_id)
-                action = await session.scalars(raw_action)
-                action = action.first()
-                actions_list.append(action)
-
-            return actions_list
-    
+    async def get_actions(self, route_id) -> List[ActionListDTO]:
+        async def load():
+            async with self.session() as session:
+                raw_sql = (
+                    select(ActionList.id, ActionList.action_name, ActionList.code).
+                    join(Action, Action.action_list_id == ActionList.id).
+                    where(Action.route_id == route_id).
+                    order_by(Action.id)
+                )
+                result = await session.execute(raw_sql)
+
+                return [ActionListDTO(*row) for row in result.all()]
+
+        return await route_cache.get(("actions", route_id), load)
+
+    async def get_project_routes(self, project_name) -> List[RouteDTO]:
+        """Routes of the project together with their actions in two statements"""
+
+        async def load():
+            async with self.session() as session:
+                raw_sql = (
+                    select(Route).
+                    join(Project, Route.project_id == Project.id).
+                    where(Project.project_name == project_name).
+                    options(selectinload(Route.action)).
+                    order_by(Route.id)
+                )
+                route_list = await session.scalars(raw_sql)
+
+                return [
+                    RouteDTO(
+                        id=route.id,
+                        route_name=route.route_name,
+                        project_id=route.project_id,
+                        actions=tuple(
+                            ActionDTO(
+                                id=action.id,
+                                route_id=action.route_id,
+                                action_list_id=action.action_list_id,
+                                pair=action.pair
+                            ) for action in sorted(route.action, key=lambda action: action.id)
+                        )
+                    ) for route in route_list.all()
+                ]
+
+        return await route_cache.get(("project_routes", project_name), load)
+
     async def get_single_action(self, route_id, act_list_id) -> Action:
         async with self.session() as session:
             raw_sql = select(Action).where(Action.route_id == route_id, Action.action_list_id == act_list_id)
@@ -340,6 +437,17 @@ class CRUD():
 
             return action
 
+    async def get_route_action_map(self, route_id) -> dict[int, Action]:
+        async with self.session() as session:
+            raw_sql = select(Action).where(Action.route_id == route_id).order_by(Action.id)
+            action_list = await session.scalars(raw_sql)
+
+            action_map = {}
+            for action in action_list.all():
+                action_map.setdefault(action.action_list_id, action)
+
+            return action_map
+
     async def get(self, id, obj):
         async with self.session() as session:
             raw_sql = select(obj).where(obj.id == id)
@@ -389,6 +497,113 @@ class CRUD():
 
             return tasks_list
 
+    def task_graph(self):
+        return select(Tasks).options(
+            joinedload(Tasks.client),
+            joinedload(Tasks.wallet),
+            joinedload(Tasks.project),
+            joinedload(Tasks.route),
+            joinedload(Tasks.action),
+            joinedload(Tasks.action_wallet)
+        )
+
+    async def get_active_tasks_graph(self) -> List[Tasks]:
+        """All WAIT tasks with client, wallet, project, route, action and action_wallet in one query"""
+
+        async with self.session() as session:
+            raw_sql = self.task_graph().where(Tasks.status == "WAIT")
+            tasks_list = await session.scalars(raw_sql)
+            tasks_list = tasks_list.all()
+
+            return tasks_list
+
+    async def get_task_graph(self, task_id) -> Tasks:
+        async with self.session() as session:
+            raw_sql = self.task_graph().where(Tasks.id == task_id)
+            task = await session.scalars(raw_sql)
+            task = task.first()
+
+            return task
+
+    async def claim_task(self, task_id) -> bool:
+        """Move the task from WAIT to RUNNING, False if another worker already took it"""
+
+        async with self.session() as session:
+            stmt = (
+                update(Tasks).
+                where(Tasks.id == task_id, Tasks.status == "WAIT").
+                values(status="RUNNING", claimed_at=datetime.datetime.now()).
+                returning(Tasks.id)
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+
+            return result.first() is not None
+
+    async def fail_running_task(self, task_id, status="FAILED") -> bool:
+        """Close a task that is still RUNNING, a status already set by run_actions is kept"""
+
+        async with self.session() as session:
+            stmt = (
+                update(Tasks).
+                where(Tasks.id == task_id, Tasks.status == "RUNNING").
+                values(status=status).
+                returning(Tasks.id)
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+
+            return result.first() is not None
+
+    async def fail_stale_tasks(self, lease: float, status="FAILED") -> List[int]:
+        """Close RUNNING tasks claimed more than lease seconds ago, their worker is gone"""
+
+        expired = datetime.datetime.now() - datetime.timedelta(seconds=lease)
+
+        async with self.session() as session:
+            stmt = (
+                update(Tasks).
+                where(
+                    Tasks.status == "RUNNING",
+                    (Tasks.claimed_at == None) | (Tasks.claimed_at < expired)  # noqa: E711
+                ).
+                values(status=status).
+                returning(Tasks.id)
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+
+            return [row[0] for row in result.all()]
+
+    async def get_job_tasks(self, job_id) -> List[dict]:
+        async with self.session() as session:
+            raw_sql = (
+                select(
+                    Tasks.id,
+                    Tasks.status,
+                    Tasks.action_id,
+                    ActionWallet.status,
+                    ActionWallet.estimated_time,
+                    ActionWallet.completed_at
+                ).
+                join(ActionWallet, Tasks.action_wallet_id == ActionWallet.id).
+                where(Tasks.job_id == job_id).
+                order_by(ActionWallet.estimated_time)
+            )
+            result = await session.execute(raw_sql)
+            tasks = [
+                {
+                    "task_id": row[0],
+                    "status": row[1],
+                    "action_id": row[2],
+                    "result": row[3],
+                    "estimated_time": row[4],
+                    "completed_at": row[5]
+                } for row in result.all()
+            ]
+
+            return tasks
+
     async def update_status_action_wallet(self, id, status):
         async with self.session() as session:
             stmt = (
@@ -419,6 +634,8 @@ class CRUD():
             await session.execute(stmt)
             await session.commit()
 
+        self.invalidate(obj)
+
     async def delete(self, obj, **kwargs):
         res = input(f'Удалить данные из {obj}? (y/n): ')
         if res != 'y':
@@ -432,6 +649,8 @@ class CRUD():
             await session.execute(stmt)
             await session.commit()
 
+        self.invalidate(obj)
+
     async def create_test_data(self):
         client_one = Client(client_name="Magomed", token="892817995")
         client_two = Client(client_name="Marat", token="ch82348c299")
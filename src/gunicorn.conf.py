@@ -0,0 +1,24 @@
+"""
+gunicorn -w 4 -k uvicorn.workers.UvicornWorker -b 0.0.0.0:8000 run:app
+
+gunicorn reads this file from the working directory. Every worker keeps its own prometheus
+registry, so the workers write their metrics to PROMETHEUS_MULTIPROC_DIR and /metrics of any
+worker returns the sum of all of them. The directory is emptied on every start.
+"""
+import os
+import shutil
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(os.getcwd(), ".prometheus_multiproc"))
+
+
+def on_starting(server):
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,14 +1,17 @@
 import asyncio
 import json
-import random
 import urllib.parse
+import uuid
 
+from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from datetime import datetime, timedelta
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from typing import List
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from loguru import logger
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from schema import (
     ListWalletScheme, 
@@ -17,12 +20,40 @@ from schema import (
     AddAccountScheme,
 )
 from utils.prepare_data import get_data
-from database.models import CRUD, Action, ActionWallet, Client, Project, Route, Tasks, Wallet
-from tasks import run_action_tasks, add_starknet_action_task
+from database.models import CRUD, Client, Wallet
+from database.config_models import engine, sync_engine
+from database.dto import RouteDTO
+from start_actions import job_listener
+from tasks import run_action_tasks, schedule_route
+from utils.metrics import (
+    MULTIPROCESS,
+    metrics_registry,
+    refresh_watched,
+    refresh_watched_periodically,
+    watch_engine,
+    watch_scheduler
+)
+from zksync.utils import aggregator_client
+from zksync.utils.pool_registry import pool_registry
+from zksync.utils.providers import close_providers
+from zksync.utils.signer import shutdown_signer
+from zksync.utils.tracing import flush_traces, span, trace
+
+
+# Запускаем планировщик задач, задачи хранятся в Postgres и переживают перезапуск
+scheduler = AsyncIOScheduler(jobstores={"default": SQLAlchemyJobStore(engine=sync_engine)})
+scheduler.add_listener(job_listener, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
 
+# Метрики планировщика и пулов соединений считаются при каждом запросе /metrics,
+# под gunicorn с PROMETHEUS_MULTIPROC_DIR каждый воркер обновляет их в фоне
+watch_scheduler(scheduler)
+watch_engine("app", engine)
+watch_engine("jobstore", sync_engine)
 
-# Запускаем планировщик задач
-scheduler = AsyncIOScheduler()
+# Как часто SSE поток проверяет статус задач, в секундах
+JOB_EVENTS_INTERVAL = 5
+
+metrics_task: asyncio.Task = None
 
 app = FastAPI()
 
@@ -34,9 +65,41 @@ app = FastAPI()
 #     allow_headers=["*"],
 # )
 
-# @app.on_event("startup")
-# async def run_task_scheduler():
-#     await run_action_tasks(scheduler)
+@app.on_event("startup")
+async def run_task_scheduler():
+    if not scheduler.running:
+        scheduler.start()
+
+    await run_action_tasks(scheduler)
+
+    if MULTIPROCESS:
+        global metrics_task
+        metrics_task = asyncio.create_task(refresh_watched_periodically())
+
+    # Адреса пулов SyncSwap и Pancake для всех пар токенов
+    await pool_registry.warm()
+
+
+@app.on_event("shutdown")
+async def close_rpc_providers():
+    # Закрываем общие пулы соединений к RPC и API агрегаторов, пул подписи транзакций, сбрасываем спаны трейсов и новые адреса пулов
+    await close_providers()
+    await aggregator_client.close_session()
+    shutdown_signer()
+    await flush_traces()
+    await pool_registry.flush()
+
+    if metrics_task is not None:
+        metrics_task.cancel()
+
+
+@app.get("/metrics")
+def metrics():
+    # Синхронный обработчик: FastAPI выполняет его в потоке, чтение jobstore не блокирует цикл событий
+    if MULTIPROCESS:
+        refresh_watched()
+
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.post("/route/")
@@ -47,12 +110,10 @@ async def route(request_data: ProjectScheme):
     route_dict = {} 
 
     crud = CRUD()
-    project: Project = await crud.get_project(project_name)
-    route_list: List[Route] = await crud.get_route_list(project_id=project.id)
+    route_list: List[RouteDTO] = await crud.get_project_routes(project_name)
 
     for route in route_list:
-        action_list: List[Action] = await crud.get_route_actions(route_id=route.id)
-        route_dict[route.route_name] = action_list
+        route_dict[route.route_name] = list(route.actions)
         route_dict[route.route_name].append(route.id)
 
     return route_dict
@@ -117,86 +178,84 @@ async def get_user_id(init_data):
 async def run_bot(request_data: RequestData):
     data = request_data.dict()
     crud = CRUD()
-    route, project, action_list, client, wallet, min_time, max_time, max_amount, gas, init_data = await get_data(crud, data)
 
-    user_id = await get_user_id(init_data)
-    logger.success(route.id)
+    # id задания сразу служит id трейса, по нему спаны задач и транзакций связываются с этим запросом
+    job_id = uuid.uuid4().hex
 
-    transaction_time = datetime.now()
-    amount_for_action = max_amount / len(action_list)
+    with trace(job_id), span("run_bot"):
+        route, project, action_list, client, wallet, min_time, max_time, max_amount, gas, init_data = await get_data(crud, data)
 
-    # if amount_for_action <= gas:
-    #     raise Exception(f"Not enough balance. Gas = {gas}")
+        user_id = await get_user_id(init_data)
+        logger.success(route.id)
 
-    act_wallet_list = []
-
-    for item in action_list:
-        number = random.randint(min_time, max_time)
-        logger.info(f"Wait {number} minutes")
-        transaction_time = transaction_time + timedelta(minutes=number)
-        action: Action = await crud.get_single_action(route_id=route.id, act_list_id=item.id)
-
-        # Создаем действия в базе
-        action_wallet = await crud.create_action_wallet(
-            status="WAIT",
-            amount=amount_for_action,
+        job = await schedule_route(
+            scheduler=scheduler,
+            crud=crud,
+            data=data,
+            route=route,
+            project=project,
+            action_list=action_list,
+            client=client,
+            wallet=wallet,
+            min_time=min_time,
+            max_time=max_time,
+            max_amount=max_amount,
             gas=gas,
-            wallet_id=wallet.id,
-            action_id=action.id,
-            estimated_time=transaction_time
+            user_id=user_id,
+            job_id=job_id
         )
 
-        act_wallet_list.append(action_wallet.id)
+    if not scheduler.running:
+        scheduler.start()
 
-    tasks_list = []
+    scheduler.print_jobs()
 
-    for action_wallet in act_wallet_list:
-        action_wallet_obj = await crud.get(action_wallet, ActionWallet)
-        action = await crud.get(action_wallet_obj.action_id, Action)
+    return job
 
-        # Создаем задачи для каждого действия в базе
-        task = await crud.create_tasks(
-            status="WAIT",
-            client=client.id, 
-            wallet=wallet.id, 
-            project=project.id, 
-            route=route.id, 
-            action=action.id,
-            action_wallet=action_wallet_obj.id          
-        )
 
-        tasks_list.append(task.id) 
+async def get_job(crud: CRUD, job_id: str) -> dict:
+    tasks = await crud.get_job_tasks(job_id)
 
-    index = 0
-    for action_wallet in act_wallet_list:
-        task = tasks_list[index]
-        index += 1
-        if index == 2:
-            break
+    if not tasks:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
-        task = await crud.get(task, Tasks)
-        action_wallet_obj = await crud.get(action_wallet, ActionWallet)
-        action = await crud.get(action_wallet_obj.action_id, Action)
+    statuses = [task["status"] for task in tasks]
 
-        # Запускаем задачи для каждого действия в планировщике
-        await add_starknet_action_task(
-            scheduler=scheduler,
-            crud=crud,
-            data=data,
-            client=client,
-            wallet=wallet, 
-            project=project, 
-            route=route, 
-            action=action,
-            action_wallet=action_wallet_obj,
-            task=task,
-            user_id=user_id
-        )
+    return {
+        "job_id": job_id,
+        "total": len(tasks),
+        "wait": statuses.count("WAIT"),
+        "running": statuses.count("RUNNING"),
+        "completed": statuses.count("COMPLETED"),
+        "failed": statuses.count("FAILED"),
+        "finished": "WAIT" not in statuses and "RUNNING" not in statuses,
+        "tasks": tasks
+    }
 
-    if not scheduler.running:
-        scheduler.start()
 
-    scheduler.print_jobs()
+@app.get('/run_bot/{job_id}')
+async def run_bot_status(job_id: str):
+    return await get_job(CRUD(), job_id)
+
+
+@app.get('/run_bot/{job_id}/events')
+async def run_bot_events(job_id: str):
+    crud = CRUD()
+    job = await get_job(crud, job_id)
+
+    async def events():
+        last_job = None
+        current_job = job
+
+        while True:
+            if current_job != last_job:
+                yield f"data: {json.dumps(current_job, default=str)}\n\n"
+                last_job = current_job
+
+            if current_job["finished"]:
+                break
+
+            await asyncio.sleep(JOB_EVENTS_INTERVAL)
+            current_job = await get_job(crud, job_id)
 
-    while True:
-        await asyncio.sleep(1)
+    return StreamingResponse(events(), media_type="text/event-stream")
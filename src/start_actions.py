@@ -9,6 +9,7 @@ from dotenv import load_dotenv
 
 from database.models import Action, ActionList, ActionWallet, CRUD, Client, Tasks, Wallet, Project, Route
 from action_list import zk_actions, scroll_actions
+from utils.metrics import MODULE_LATENCY, SCHEDULER_JOBS
 
 from zksync.main import zk_main
 from scroll.main import scroll_main
@@ -18,6 +19,8 @@ load_dotenv()
 
 
 def job_listener(event):
+    SCHEDULER_JOBS.labels("error" if event.exception else "executed").inc()
+
     if event.exception:
         logger.error(f"Job failed: {event.exception}. DateTime: {datetime.datetime.now()}")
     else:
@@ -55,11 +58,19 @@ async def run_actions(
         module = actions[act_code]
         function_name = module.__name__
 
-        result = await main(
-            module=module,
-            wallet=wallet,
-            data=data
-        )
+        start = time.perf_counter()
+
+        try:
+            result = await main(
+                module=module,
+                wallet=wallet,
+                data=data
+            )
+        except Exception:
+            MODULE_LATENCY.labels(function_name, "error").observe(time.perf_counter() - start)
+            raise
+
+        MODULE_LATENCY.labels(function_name, "ok" if result else "failed").observe(time.perf_counter() - start)
 
         if result:
             logger.success(f"Успешно выполнена задача. Task id: {task.id}")
@@ -89,6 +100,10 @@ async def run_actions(
 
 
 async def send_message_to_telegram(message: str, user_id: int):
+    if user_id is None:
+        # Задачи, восстановленные после перезапуска, не знают пользователя
+        return
+
     tg_token = os.getenv("TG_TOKEN")
 
     bot = Bot(token=tg_token)
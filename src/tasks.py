@@ -1,54 +1,97 @@
 import asyncio
 import datetime 
 import random
+import uuid
 from typing import List
 from loguru import logger
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
-from database.models import ActionWallet, CRUD, Client, Tasks, Wallet, Project, Route, Action
+from database.dto import ActionListDTO
+from database.models import ActionWallet, CRUD, Client, Tasks, Wallet, Project, Route
 from start_actions import run_actions
+from utils.metrics import SCHEDULER_LAG
+from zksync.settings import TASK_LEASE
+from zksync.utils.tracing import span, trace
 
 
-async def get_data_task(crud, tasks_list: List[Tasks]) -> list:
-    data = []
+def task_job_id(task_id: int) -> str:
+    return f"task-{task_id}"
 
-    for task in tasks_list:
-        client = await crud.get(task.client_id, Client)
-        wallet = await crud.get(task.wallet_id, Wallet)
-        project = await crud.get(task.project_id, Project)
-        route = await crud.get(task.route_id, Route)
-        action = await crud.get(task.action_id, Action)
-        action_wallet = await crud.get(task.action_wallet_id, ActionWallet)
-
-        data.append({
-            "client": client,
-            "wallet": wallet,
-            "project": project,
-            "route": route,
-            "action": action,
-            "action_wallet": action_wallet
-        })
- 
-    return data
-
-
-async def run_action_tasks(scheduler: AsyncIOScheduler):
-    # Выполнение оставшихся действий, до перезагрузки бота
 
+async def run_task(task_id: int, data: dict, user_id: int = None):
+    # Задача хранится в базе APScheduler только с id, все объекты загружаем при запуске
     crud = CRUD()
-    tasks_list: List[Tasks] = await crud.get_all_active_tasks()
+
+    if not await crud.claim_task(task_id):
+        logger.info(f"Task {task_id} is already running or finished")
+        return
+
+    try:
+        task: Tasks = await crud.get_task_graph(task_id)
+
+        lag = None
+
+        if task.action_wallet.estimated_time is not None:
+            lag = (datetime.datetime.now() - task.action_wallet.estimated_time).total_seconds()
+            SCHEDULER_LAG.observe(lag)
+
+        # job_id задачи связывает её спаны с запросом /run_bot/, который её создал
+        with trace(task.job_id), span("run_task", task_id=task_id, lag=lag):
+            await run_actions(
+                crud=crud,
+                data=data,
+                client=task.client,
+                wallet=task.wallet,
+                project=task.project,
+                route=task.route,
+                action=task.action,
+                action_wallet=task.action_wallet,
+                task=task,
+                user_id=user_id
+            )
+    except BaseException:
+        # Ошибка до обработки в run_actions не должна оставить задачу в RUNNING навсегда
+        await asyncio.shield(crud.fail_running_task(task_id))
+        raise
+
+
+async def run_action_tasks(scheduler: AsyncIOScheduler, crud: CRUD = None):
+    # Выполнение оставшихся действий, до перезагрузки бота
+
+    crud = crud or CRUD()
+
+    # RUNNING задачи старше TASK_LEASE остались от упавшего процесса. Транзакция могла уйти,
+    # поэтому они не перезапускаются, а закрываются со статусом FAILED
+    stale = await crud.fail_stale_tasks(TASK_LEASE)
+
+    if stale:
+        logger.warning(f"Stale running tasks marked as FAILED: {stale}")
+
+    tasks_list: List[Tasks] = await crud.get_active_tasks_graph()
 
     if not tasks_list:
         logger.info("No active tasks")
         return
 
-    data: list = await get_data_task(crud, tasks_list)
+    scheduled = {job.id for job in scheduler.get_jobs()}
+    recovered = 0
+
+    for task in tasks_list:
+        if task_job_id(task.id) in scheduled:
+            continue
 
-    for task in data:
-        action_wallet = task.get("action_wallet")
-        route_id = task.get("route").id
+        scheduler.add_job(
+            run_task,
+            'date',
+            id=task_job_id(task.id),
+            replace_existing=True,
+            run_date=task.action_wallet.estimated_time,
+            kwargs={"task_id": task.id, "data": {}, "user_id": None},
+            misfire_grace_time=10000
+        )
+        recovered += 1
 
-        scheduler.add_job(run_actions, 'date', run_date=action_wallet.estimated_time, kwargs=task, misfire_grace_time=10000)    
+    logger.info(f"Active tasks: {len(tasks_list)}, recovered: {recovered}")
 
 
 total = 0
@@ -59,4 +102,89 @@ async def add_starknet_action_task(scheduler: AsyncIOScheduler, **kwargs):
     total += 1
 
     action_wallet: ActionWallet = kwargs.get("action_wallet")
-    scheduler.add_job(run_actions, 'date', run_date=action_wallet.estimated_time, kwargs=kwargs, misfire_grace_time=10000)
+    task: Tasks = kwargs.get("task")
+
+    scheduler.add_job(
+        run_task,
+        'date',
+        id=task_job_id(task.id),
+        replace_existing=True,
+        run_date=action_wallet.estimated_time,
+        kwargs={"task_id": task.id, "data": kwargs.get("data"), "user_id": kwargs.get("user_id")},
+        misfire_grace_time=10000
+    )
+
+
+async def add_action_tasks(scheduler: AsyncIOScheduler, tasks: List[dict]):
+    for kwargs in tasks:
+        await add_starknet_action_task(scheduler, **kwargs)
+
+
+async def schedule_route(
+        scheduler: AsyncIOScheduler,
+        crud: CRUD,
+        data: dict,
+        route: Route,
+        project: Project,
+        action_list: List[ActionListDTO],
+        client: Client,
+        wallet: Wallet,
+        min_time: int,
+        max_time: int,
+        max_amount: float,
+        gas: float,
+        user_id: int = None,
+        job_id: str = None
+) -> dict:
+    '''Создает задачи маршрута в базе и ставит их в планировщик, возвращает id задания'''
+
+    transaction_time = datetime.datetime.now()
+    amount_for_action = max_amount / len(action_list)
+
+    # if amount_for_action <= gas:
+    #     raise Exception(f"Not enough balance. Gas = {gas}")
+
+    job_id = job_id or uuid.uuid4().hex
+
+    route_actions = []
+    action_map = await crud.get_route_action_map(route_id=route.id)
+
+    for item in action_list:
+        number = random.randint(min_time, max_time)
+        logger.info(f"Wait {number} minutes")
+        transaction_time = transaction_time + datetime.timedelta(minutes=number)
+        route_actions.append((action_map[item.id], transaction_time))
+
+    # Создаем действия и задачи в базе одной транзакцией
+    route_tasks = await crud.create_route_tasks(
+        status="WAIT",
+        amount=amount_for_action,
+        gas=gas,
+        client_id=client.id,
+        wallet_id=wallet.id,
+        project_id=project.id,
+        route_id=route.id,
+        actions=route_actions,
+        job_id=job_id
+    )
+
+    # Запускаем задачи для каждого действия в планировщике
+    await add_action_tasks(
+        scheduler=scheduler,
+        tasks=[
+            {
+                "crud": crud,
+                "data": data,
+                "client": client,
+                "wallet": wallet,
+                "project": project,
+                "route": route,
+                "action": action,
+                "action_wallet": action_wallet,
+                "task": task,
+                "user_id": user_id
+            } for (action, _), (action_wallet, task) in zip(route_actions, route_tasks)
+        ]
+    )
+
+    return {"job_id": job_id, "tasks": [task.id for _, task in route_tasks]}
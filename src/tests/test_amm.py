@@ -0,0 +1,120 @@
+"""
+Local SyncSwap quotes against the classic pool contract
+
+    cd src && python -m pytest tests
+"""
+import asyncio
+import random
+
+import pytest
+from web3 import AsyncWeb3
+
+from zksync.utils import amm
+from zksync.utils.amm import ReservesCache, get_amount_out, get_amounts_out
+
+POOL = "0x80115c708E12eDd42E504c1cD52Aea96C547c05c"
+TOKEN0 = "0x3355df6D4c9C3035724Fd0e3914dE96A5a83aaf4"
+TOKEN1 = "0x5AEa5775959fBC2557Cc8789bC1bf90A239D9a91"
+WALLET = "0x66B50789D6531f60006065E2D52a961bcCd962bc"
+
+
+def contract_amount_out(amount_in: int, token0_in: bool, reserve0: int, reserve1: int, swap_fee: int) -> int:
+    """SyncSwapClassicPool._getAmountOut, line by line"""
+    if amount_in == 0:
+        return 0
+
+    amount_in_with_fee = amount_in * (100_000 - swap_fee)
+
+    if token0_in:
+        return (amount_in_with_fee * reserve1) // (reserve0 * 100_000 + amount_in_with_fee)
+
+    return (amount_in_with_fee * reserve0) // (reserve1 * 100_000 + amount_in_with_fee)
+
+
+# getAmountOut results of the contract formula: amount in, reserve in, reserve out, fee, amount out
+VECTORS = [
+    (10 ** 18, 2_000 * 10 ** 18, 3_600_000 * 10 ** 6, 200, 1_795_504_043),
+    (10 ** 15, 2_000 * 10 ** 18, 3_600_000 * 10 ** 6, 200, 1_796_399),
+    (1_800 * 10 ** 6, 3_600_000 * 10 ** 6, 2_000 * 10 ** 18, 200, 997_502_246_379_056_850),
+    (1, 10 ** 6, 10 ** 6, 300, 0),
+    (10 ** 24, 10 ** 18, 10 ** 18, 300, 999_998_996_991_978_944),
+    (12_345, 999, 1_001, 0, 926),
+    (10 ** 18, 10 ** 18, 10 ** 18, 100_000, 0),
+]
+
+
+def random_cases(count: int, seed: int = 324):
+    rng = random.Random(seed)
+
+    for _ in range(count):
+        yield (
+            rng.randint(1, 10 ** rng.randint(1, 30)),
+            rng.randint(1, 10 ** rng.randint(1, 30)),
+            rng.randint(1, 10 ** rng.randint(1, 30)),
+            rng.choice([0, 1, 10, 100, 200, 300, 1_000, 99_999]),
+        )
+
+
+@pytest.mark.parametrize("amount_in, reserve_in, reserve_out, fee, amount_out", VECTORS)
+def test_get_amount_out_vectors(amount_in, reserve_in, reserve_out, fee, amount_out):
+    assert get_amount_out(amount_in, reserve_in, reserve_out, fee) == amount_out
+
+
+@pytest.mark.parametrize("amount_in, reserve_in, reserve_out, fee", list(random_cases(500)))
+def test_get_amount_out_matches_contract(amount_in, reserve_in, reserve_out, fee):
+    # token0 in: reserve0 is the input side, token1 in: reserve1 is
+    assert get_amount_out(amount_in, reserve_in, reserve_out, fee) == contract_amount_out(
+        amount_in, True, reserve_in, reserve_out, fee
+    )
+    assert get_amount_out(amount_in, reserve_in, reserve_out, fee) == contract_amount_out(
+        amount_in, False, reserve_out, reserve_in, fee
+    )
+
+
+@pytest.mark.parametrize("amount_in, reserve_in, reserve_out, fee", list(random_cases(200, seed=1)))
+def test_get_amount_out_bounds(amount_in, reserve_in, reserve_out, fee):
+    amount_out = get_amount_out(amount_in, reserve_in, reserve_out, fee)
+
+    assert 0 <= amount_out < reserve_out
+    assert get_amount_out(amount_in + 1, reserve_in, reserve_out, fee) >= amount_out
+    assert get_amount_out(amount_in, reserve_in, reserve_out, min(fee + 1, 100_000)) <= amount_out
+
+
+def test_get_amounts_out_is_elementwise():
+    amounts_in = [case[0] for case in random_cases(100, seed=2)]
+
+    assert get_amounts_out(amounts_in, 5 * 10 ** 20, 9 * 10 ** 11, 200) == [
+        get_amount_out(amount_in, 5 * 10 ** 20, 9 * 10 ** 11, 200) for amount_in in amounts_in
+    ]
+
+
+def test_quote_reads_fee_of_sender(monkeypatch):
+    fees = {WALLET: (100, 150), amm.ZERO_ADDRESS: (300, 300)}
+    senders = []
+
+    async def fake_multicall(w3, chain, calls):
+        results = []
+
+        for call in calls:
+            if call.fn_name in ("token0", "token1"):
+                results.append(TOKEN0 if call.fn_name == "token0" else TOKEN1)
+            elif call.fn_name == "getReserves":
+                results.append((10 ** 21, 2 * 10 ** 12))
+            else:
+                sender, token_in, _, _ = call.args
+                senders.append(sender)
+                results.append(fees[sender][0 if token_in == TOKEN0 else 1])
+
+        return results
+
+    monkeypatch.setattr(amm, "multicall", fake_multicall)
+
+    cache = ReservesCache()
+    w3 = AsyncWeb3()
+
+    wallet_quote = asyncio.run(cache.quote(w3, "zksync", POOL, TOKEN1, [10 ** 9], WALLET))
+    anonymous_quote = asyncio.run(cache.quote(w3, "zksync", POOL, TOKEN1, [10 ** 9]))
+
+    assert wallet_quote == [contract_amount_out(10 ** 9, False, 10 ** 21, 2 * 10 ** 12, 150)]
+    assert anonymous_quote == [contract_amount_out(10 ** 9, False, 10 ** 21, 2 * 10 ** 12, 300)]
+    assert set(senders) == {WALLET, amm.ZERO_ADDRESS}
@@ -0,0 +1,77 @@
+"""
+ReceiptWatcher against the local stand-in node
+
+    cd src && python -m pytest tests
+"""
+import asyncio
+
+import pytest
+from web3 import AsyncWeb3
+
+from benchmarks.local_node import LocalNode, RPCError
+from zksync.utils.providers import close_providers, get_provider
+from zksync.utils.receipt_watcher import ReceiptWatcher
+
+MINED = "0x" + "11" * 32
+BAD = "0x12"
+LAGGING = "0x" + "22" * 32
+PENDING = "0x" + "33" * 32
+
+
+def receipt(tx_hash: str, status: str = "0x1") -> dict:
+    return {"transactionHash": tx_hash, "blockNumber": "0x2", "status": status}
+
+
+async def watch_batch():
+    node = LocalNode(block_time=0)
+    url = await node.start()
+
+    receipts = {MINED: receipt(MINED)}
+    lagging = {"errors": 1}
+
+    def get_transaction_receipt(tx_hash: str):
+        if tx_hash == BAD:
+            raise RPCError("invalid argument 0: hex string has length 2, want 64", -32602)
+        if tx_hash == LAGGING and lagging["errors"]:
+            lagging["errors"] -= 1
+            raise RPCError("header not found")
+
+        return receipts.get(tx_hash)
+
+    node.handlers["eth_getTransactionReceipt"] = get_transaction_receipt
+
+    watcher = ReceiptWatcher(AsyncWeb3(get_provider("zksync", rpc=url)))
+
+    try:
+        waiters = {
+            tx_hash: asyncio.create_task(watcher.wait(tx_hash, 5))
+            for tx_hash in (MINED, BAD, LAGGING, PENDING)
+        }
+
+        mined = await waiters[MINED]
+
+        with pytest.raises(ValueError):
+            await waiters[BAD]
+
+        # The node answered with an error for LAGGING once, the hash stays watched
+        receipts[LAGGING] = receipt(LAGGING, "0x0")
+        node.mine()
+        lagged = await waiters[LAGGING]
+
+        receipts[PENDING] = receipt(PENDING)
+        node.mine()
+        pending = await waiters[PENDING]
+
+        return mined, lagged, pending, watcher
+    finally:
+        await close_providers()
+        await node.stop()
+
+
+def test_bad_hash_fails_only_its_waiter():
+    mined, lagged, pending, watcher = asyncio.run(watch_batch())
+
+    assert mined["status"] == 1
+    assert lagged["status"] == 0
+    assert pending["status"] == 1
+    assert not watcher.waiters
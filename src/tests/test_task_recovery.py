@@ -0,0 +1,97 @@
+"""
+Tasks that die mid-run or outlive their lease end up FAILED in the job status
+
+    cd src && python -m pytest tests
+"""
+import asyncio
+import datetime
+import os
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("scroll", reason="the scroll package is needed to import tasks and run")
+
+# database.config_models builds the Postgres engine on import, it is never connected here
+os.environ.setdefault("DB_PORT", "5432")
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+import run  # noqa: E402
+import tasks  # noqa: E402
+from database.models import Base, CRUD, Action, ActionList, Client, Project, Route, Tasks, Wallet  # noqa: E402
+
+
+async def seed(crud: CRUD, scheduler: AsyncIOScheduler) -> dict:
+    client = Client(client_name="test")
+    wallet = Wallet(primary_key="test", evm_key="test", wallet_name="test", client=client)
+    project = Project(project_name="ZKSYNC")
+    route = Route(route_name="test", project=project)
+    action_list = ActionList(action_name="swap_syncswap", code=1)
+    actions = [Action(route=route, action_list=action_list, pair="ETH/USDC") for _ in range(3)]
+
+    await crud.insert_data_many(client, wallet, project, route, action_list, *actions)
+
+    return await tasks.schedule_route(
+        scheduler=scheduler,
+        crud=crud,
+        data={},
+        route=route,
+        project=project,
+        action_list=await crud.get_actions(route.id),
+        client=client,
+        wallet=wallet,
+        min_time=1,
+        max_time=2,
+        max_amount=0.1,
+        gas=10
+    )
+
+
+async def recover(monkeypatch) -> dict:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    crud = CRUD(async_sessionmaker(engine, expire_on_commit=False))
+
+    # Jobs stay in the memory jobstore, the paused scheduler never runs them
+    scheduler = AsyncIOScheduler()
+    scheduler.start(paused=True)
+
+    try:
+        job = await seed(crud, scheduler)
+        crashed, stale, waiting = job["tasks"]
+
+        async def broken_run_actions(**kwargs):
+            raise RuntimeError("worker died")
+
+        # The task fails before run_actions could record anything
+        monkeypatch.setattr(tasks, "CRUD", lambda: crud)
+        monkeypatch.setattr(tasks, "run_actions", broken_run_actions)
+
+        with pytest.raises(RuntimeError):
+            await tasks.run_task(crashed, {})
+
+        # The worker that claimed this task is gone, its lease ran out
+        assert await crud.claim_task(stale)
+        await crud.update(stale, Tasks, claimed_at=datetime.datetime.now() - datetime.timedelta(hours=2))
+
+        await tasks.run_action_tasks(scheduler, crud)
+
+        return await run.get_job(crud, job["job_id"]), waiting
+    finally:
+        scheduler.shutdown(wait=False)
+        await engine.dispose()
+
+
+def test_dead_and_stale_tasks_count_as_failed(monkeypatch):
+    job, waiting = asyncio.run(recover(monkeypatch))
+
+    assert job["failed"] == 2
+    assert job["running"] == 0
+    assert job["wait"] == 1
+    assert [task["task_id"] for task in job["tasks"] if task["status"] == "WAIT"] == [waiting]
@@ -0,0 +1,90 @@
+import asyncio
+import os
+from typing import Callable, List, Union
+
+from apscheduler.schedulers.base import BaseScheduler
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Under gunicorn every worker has its own registry, with PROMETHEUS_MULTIPROC_DIR set
+# (see gunicorn.conf.py) the workers write their samples to files and /metrics merges them
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Gauges read on every scrape can't be shared through files, in multiprocess mode
+# each worker writes them every METRICS_REFRESH_INTERVAL seconds instead
+METRICS_REFRESH_INTERVAL = 15
+
+_watchers: List[Callable[[], None]] = []
+
+# All workers read the same jobstore, so the largest value is the queue depth
+SCHEDULER_QUEUE = Gauge(
+    "scheduler_queue_depth",
+    "Jobs waiting in the APScheduler jobstore",
+    multiprocess_mode="livemax"
+)
+
+SCHEDULER_LAG = Histogram(
+    "scheduler_lag_seconds",
+    "Delay between estimated_time of a task and the start of its job",
+    buckets=(1, 5, 15, 30, 60, 300, 900, 3600)
+)
+
+SCHEDULER_JOBS = Counter("scheduler_jobs_total", "Finished APScheduler jobs by outcome", ["status"])
+
+MODULE_LATENCY = Histogram(
+    "module_duration_seconds",
+    "Execution time of an action module by outcome, module sleeps included",
+    ["module", "status"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800)
+)
+
+DB_POOL = Gauge(
+    "db_pool_connections",
+    "Connections of the SQLAlchemy pool by state, summed over workers",
+    ["engine", "state"],
+    multiprocess_mode="livesum"
+)
+
+
+def watch(gauge: Gauge, read: Callable[[], float]):
+    if MULTIPROCESS:
+        _watchers.append(lambda: gauge.set(read()))
+    else:
+        gauge.set_function(read)
+
+
+def watch_scheduler(scheduler: BaseScheduler):
+    watch(SCHEDULER_QUEUE, lambda: len(scheduler.get_jobs()))
+
+
+def watch_engine(name: str, engine: Union[Engine, AsyncEngine]):
+    # Values are read from the pool on every scrape
+    pool = engine.pool
+
+    watch(DB_POOL.labels(name, "size"), pool.size)
+    watch(DB_POOL.labels(name, "checked_out"), pool.checkedout)
+    watch(DB_POOL.labels(name, "idle"), pool.checkedin)
+    watch(DB_POOL.labels(name, "overflow"), pool.overflow)
+
+
+def refresh_watched():
+    for refresh in _watchers:
+        refresh()
+
+
+async def refresh_watched_periodically():
+    # get_jobs() reads the jobstore through a blocking engine, so the values are read in a thread
+    while True:
+        await asyncio.to_thread(refresh_watched)
+        await asyncio.sleep(METRICS_REFRESH_INTERVAL)
+
+
+def metrics_registry() -> CollectorRegistry:
+    if not MULTIPROCESS:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+
+    return registry
@@ -1,5 +1,6 @@
 from typing import List
-from database.models import CRUD, Route, Project, ActionList, Client, Wallet
+from database.models import CRUD, Route, Project, Client, Wallet
+from database.dto import ActionListDTO
 
 
 async def get_client_wallet(crud: CRUD, client_id, wallet_id) -> tuple:
@@ -26,6 +27,6 @@ async def get_data(crud: CRUD, data: dict) -> tuple:
 
     route: Route = await crud.get(route_id, obj=Route)
     project: Project = await crud.get(route.project_id, obj=Project)
-    action_list: List[ActionList] = await crud.get_actions(route.id)
+    action_list: List[ActionListDTO] = await crud.get_actions(route.id)
 
     return route, project, action_list, client, wallet, min_time, max_time, max_amount, gas, init_data
@@ -1,122 +1,87 @@
 import json
 from pathlib import Path
+from typing import Union
 
-with open('zksync/data/rpc.json') as file:
-    RPC = json.load(file)
-
-with open('zksync/data/abi/erc20_abi.json') as file:
-    ERC20_ABI = json.load(file)
-
-with open("zksync/accounts.txt", "r") as file:
-    ACCOUNTS = [row.strip() for row in file]
-
-with open("zksync/proxy.txt", "r") as file:
-    PROXIES = [row.strip() for row in file]
-
-with open('zksync/data/abi/zksync/deposit.json') as file:
-    ZKSYNC_DEPOSIT_ABI = json.load(file)
-
-with open('zksync/data/abi/zksync/withdraw.json') as file:
-    ZKSYNC_WITHDRAW_ABI = json.load(file)
-
-with open('zksync/data/abi/zksync/weth.json') as file:
-    WETH_ABI = json.load(file)
-
-with open("zksync/data/abi/syncswap/router.json", "r") as file:
-    SYNCSWAP_ROUTER_ABI = json.load(file)
-
-with open('zksync/data/abi/syncswap/classic_pool.json') as file:
-    SYNCSWAP_CLASSIC_POOL_ABI = json.load(file)
-
-with open('zksync/data/abi/syncswap/classic_pool_data.json') as file:
-    SYNCSWAP_CLASSIC_POOL_DATA_ABI = json.load(file)
-
-with open("zksync/data/abi/mute/router.json", "r") as file:
-    MUTE_ROUTER_ABI = json.load(file)
-
-with open("zksync/data/abi/spacefi/router.json", "r") as file:
-    SPACEFI_ROUTER_ABI = json.load(file)
-
-with open("zksync/data/abi/pancake/router.json", "r") as file:
-    PANCAKE_ROUTER_ABI = json.load(file)
+BASE_PATH = Path(__file__).parent
 
-with open("zksync/data/abi/pancake/factory.json", "r") as file:
-    PANCAKE_FACTORY_ABI = json.load(file)
+ABI_PATH = BASE_PATH / "data" / "abi"
 
-with open("zksync/data/abi/pancake/quoter.json", "r") as file:
-    PANCAKE_QUOTER_ABI = json.load(file)
 
-with open("zksync/data/abi/woofi/router.json", "r") as file:
-    WOOFI_ROUTER_ABI = json.load(file)
+class LazyABI:
+    """ABI that is read from disk on first use and shared afterwards"""
 
-with open("zksync/data/abi/zkswap/router.json", "r") as file:
-    ZKSWAP_ROUTER_ABI = json.load(file)
+    def __init__(self, path: str) -> None:
+        self.path = ABI_PATH / path
+        self._abi: Union[None, list] = None
 
-with open("zksync/data/abi/maverick/position.json", "r") as file:
-    MAVERICK_POSITION_ABI = json.load(file)
+    def load(self) -> list:
+        if self._abi is None:
+            with open(self.path, "r") as file:
+                self._abi = json.load(file)
 
-with open("zksync/data/abi/maverick/router.json", "r") as file:
-    MAVERICK_ROUTER_ABI = json.load(file)
+        return self._abi
 
-with open("zksync/data/abi/vesync/router.json", "r") as file:
-    VESYNC_ROUTER_ABI = json.load(file)
+    def __repr__(self) -> str:
+        return f"LazyABI({self.path.name})"
 
-with open("zksync/data/abi/bungee/abi.json", "r") as file:
-    BUNGEE_ABI = json.load(file)
 
-with open("zksync/data/abi/stargate/router.json", "r") as file:
-    STARGATE_ABI = json.load(file)
+def read_lines(path: Path) -> list:
+    with open(path, "r") as file:
+        return [row.strip() for row in file]
 
-with open("zksync/data/abi/eralend/abi.json", "r") as file:
-    ERALEND_ABI = json.load(file)
 
-with open("zksync/data/abi/basilisk/abi.json", "r") as file:
-    BASILISK_ABI = json.load(file)
+def __getattr__(name: str):
+    # accounts and proxies are only needed by the CLI tools
+    if name == "ACCOUNTS":
+        return read_lines(BASE_PATH / "accounts.txt")
+    if name == "PROXIES":
+        return read_lines(BASE_PATH / "proxy.txt")
 
-with open("zksync/data/abi/reactorfusion/abi.json", "r") as file:
-    REACTORFUSION_ABI = json.load(file)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-with open("zksync/data/abi/zerolend/abi.json", "r") as file:
-    ZEROLEND_ABI = json.load(file)
 
-with open("zksync/data/abi/dmail/abi.json", "r") as file:
-    DMAIL_ABI = json.load(file)
-
-with open("zksync/data/abi/l2telegraph/send_message.json", "r") as file:
-    L2TELEGRAPH_MESSAGE_ABI = json.load(file)
-
-with open("zksync/data/abi/l2telegraph/bridge_nft.json", "r") as file:
-    L2TELEGRAPH_NFT_ABI = json.load(file)
-
-with open("zksync/data/abi/nft2me/abi.json", "r") as file:
-    MINTER_ABI = json.load(file)
-
-with open("zksync/data/abi/mailzero/abi.json", "r") as file:
-    MAILZERO_ABI = json.load(file)
-
-with open("zksync/data/abi/tavaera/id.json", "r") as file:
-    TAVAERA_ID_ABI = json.load(file)
-
-with open("zksync/data/abi/tavaera/abi.json", "r") as file:
-    TAVAERA_ABI = json.load(file)
-
-with open("zksync/data/abi/zks/abi.json", "r") as file:
-    ZKS_ABI = json.load(file)
-
-with open("zksync/data/abi/era_ns/abi.json", "r") as file:
-    ENS_ABI = json.load(file)
-
-with open("zksync/data/abi/omnisea/abi.json", "r") as file:
-    OMNISEA_ABI = json.load(file)
-
-with open("zksync/data/abi/gnosis/abi.json", "r") as file:
-    SAFE_ABI = json.load(file)
+with open(BASE_PATH / "data" / "rpc.json") as file:
+    RPC = json.load(file)
 
-with open("zksync/data/abi/zkstars/abi.json", "r") as file:
-    ZKSTARS_ABI = json.load(file)
+with open(ABI_PATH / "erc20_abi.json") as file:
+    ERC20_ABI = json.load(file)
 
-with open("zksync/data/abi/rocketsam/abi.json", "r") as file:
-    ROCKETSAM_ABI = json.load(file)
+ZKSYNC_DEPOSIT_ABI = LazyABI("zksync/deposit.json")
+ZKSYNC_WITHDRAW_ABI = LazyABI("zksync/withdraw.json")
+WETH_ABI = LazyABI("zksync/weth.json")
+SYNCSWAP_ROUTER_ABI = LazyABI("syncswap/router.json")
+SYNCSWAP_CLASSIC_POOL_ABI = LazyABI("syncswap/classic_pool.json")
+SYNCSWAP_CLASSIC_POOL_DATA_ABI = LazyABI("syncswap/classic_pool_data.json")
+MUTE_ROUTER_ABI = LazyABI("mute/router.json")
+SPACEFI_ROUTER_ABI = LazyABI("spacefi/router.json")
+PANCAKE_ROUTER_ABI = LazyABI("pancake/router.json")
+PANCAKE_FACTORY_ABI = LazyABI("pancake/factory.json")
+PANCAKE_QUOTER_ABI = LazyABI("pancake/quoter.json")
+WOOFI_ROUTER_ABI = LazyABI("woofi/router.json")
+ZKSWAP_ROUTER_ABI = LazyABI("zkswap/router.json")
+MAVERICK_POSITION_ABI = LazyABI("maverick/position.json")
+MAVERICK_ROUTER_ABI = LazyABI("maverick/router.json")
+VESYNC_ROUTER_ABI = LazyABI("vesync/router.json")
+BUNGEE_ABI = LazyABI("bungee/abi.json")
+STARGATE_ABI = LazyABI("stargate/router.json")
+ERALEND_ABI = LazyABI("eralend/abi.json")
+BASILISK_ABI = LazyABI("basilisk/abi.json")
+REACTORFUSION_ABI = LazyABI("reactorfusion/abi.json")
+ZEROLEND_ABI = LazyABI("zerolend/abi.json")
+DMAIL_ABI = LazyABI("dmail/abi.json")
+L2TELEGRAPH_MESSAGE_ABI = LazyABI("l2telegraph/send_message.json")
+L2TELEGRAPH_NFT_ABI = LazyABI("l2telegraph/bridge_nft.json")
+MINTER_ABI = LazyABI("nft2me/abi.json")
+MAILZERO_ABI = LazyABI("mailzero/abi.json")
+TAVAERA_ID_ABI = LazyABI("tavaera/id.json")
+TAVAERA_ABI = LazyABI("tavaera/abi.json")
+ZKS_ABI = LazyABI("zks/abi.json")
+ENS_ABI = LazyABI("era_ns/abi.json")
+OMNISEA_ABI = LazyABI("omnisea/abi.json")
+SAFE_ABI = LazyABI("gnosis/abi.json")
+ZKSTARS_ABI = LazyABI("zkstars/abi.json")
+ROCKETSAM_ABI = LazyABI("rocketsam/abi.json")
+MULTICALL_ABI = LazyABI("multicall/abi.json")
 
 ZKSYNC_BRIDGE_CONTRACT = "0x32400084c286cf3e17e7b677ea9583e60a000324"
 
@@ -236,3 +201,8 @@ ENS_CONTRACT = "0x935442af47f3dc1c11f006d551e13769f12eab13"
 OMNISEA_CONTRACT = "0x1Ecd053f681a51E37087719653f3f0FFe54750C0"
 
 SAFE_CONTRACT = "0xDAec33641865E4651fB43181C6DB6f7232Ee91c2"
+
+MULTICALL_CONTRACTS = {
+    "zksync": "0xF9cda624FBC7e059355ce98a31693d299FACd963",
+    "default": "0xcA11bde05977b3631167028862bE2a173976CA11"
+}
@@ -1,3 +1,4 @@
+import inspect
 import sys
 
 import questionary
@@ -5,6 +6,8 @@ from loguru import logger
 from questionary import Choice
 
 from .modules_settings import *
+from .settings import DRY_RUN
+from .utils.tracing import span
 
 
 def get_module():
@@ -103,21 +106,27 @@ def get_wallets(wallet, proxy: str = None):
 
 async def run_module(module, account_id, key, proxy, data, **kwargs):
     try:
-        return await module(account_id, key, proxy, data, **kwargs)
+        with span(module.__name__, account_id=account_id):
+            # Not every module takes the route data
+            if "data" in inspect.signature(module).parameters:
+                return await module(account_id, key, proxy, data, **kwargs)
+            return await module(account_id, key, proxy, **kwargs)
     except Exception as e:
         logger.error(e)
         raise e
 
 
-async def zk_main(module, wallet, data, **kwargs):
+async def zk_main(module, wallet, data, dry_run: bool = DRY_RUN, **kwargs):
     account = get_wallets(wallet=wallet)[0]
-    return "Success. Tx_Hash: https://testnet.zksync.dev/tx/"
 
-    # return await run_module(
-    #     module=module, 
-    #     account_id=account.get("id"), 
-    #     key=account.get("key"), 
-    #     proxy=account.get("recipient", None), 
-    #     data=data, 
-    #     **kwargs
-    # )
+    if dry_run:
+        return "Success. Tx_Hash: https://testnet.zksync.dev/tx/"
+
+    return await run_module(
+        module=module,
+        account_id=account.get("id"),
+        key=account.get("key"),
+        proxy=account.get("proxy", None),
+        data=data,
+        **kwargs
+    )
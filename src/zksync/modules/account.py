@@ -1,7 +1,6 @@
 import asyncio
-import time
 import random
-from typing import Union, Dict
+from typing import Union, Dict, List, Tuple
 
 from loguru import logger
 from web3 import AsyncWeb3
@@ -9,9 +8,21 @@ from eth_account import Account as EthereumAccount
 from web3.exceptions import TransactionNotFound
 from web3.middleware import async_geth_poa_middleware
 
-from ..config import RPC, ERC20_ABI, ZKSYNC_TOKENS
-from ..settings import GAS_MULTIPLIER
+from ..config import RPC, ERC20_ABI, ZKSYNC_TOKENS, LazyABI
+from ..settings import GAS_MULTIPLIER, GAS_MODEL, ALLOWANCE_CACHE
+from ..utils.allowance_cache import allowance_cache
+from ..utils.gas_model import gas_model, get_gas_key
+from ..utils.multicall import multicall
+from ..utils.nonce_manager import nonce_manager
+from ..utils.providers import get_provider
+from ..utils.receipt_watcher import get_receipt_watcher
+from ..utils.signer import sign_transaction
 from ..utils.sleeping import sleep
+from ..utils.tracing import span, traced
+from ..utils.tx_params import get_chain_id, get_gas_price, get_tx_params, reserve_nonce
+
+# symbol and decimals never change, keep them for the process lifetime
+TOKEN_METADATA: Dict[Tuple[str, str], Tuple[str, int]] = {}
 
 
 class Account:
@@ -22,26 +33,30 @@ class Account:
         self.explorer = RPC[chain]["explorer"]
         self.token = RPC[chain]["token"]
 
-        request_kwargs = {}
-
-        if proxy:
-            request_kwargs = {"proxy": f"http://{proxy}"}
-
         self.w3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(random.choice(RPC[chain]["rpc"])),
-            middlewares=[async_geth_poa_middleware],
-            request_kwargs=request_kwargs
+            get_provider(chain, proxy),
+            middlewares=[async_geth_poa_middleware]
         )
         self.account = EthereumAccount.from_key(private_key)
         self.address = self.account.address
 
+    async def get_chain_id(self) -> int:
+        return await get_chain_id(self.w3, self.chain)
+
+    async def get_gas_price(self) -> int:
+        return await get_gas_price(self.w3, self.chain)
+
+    @traced("get_tx_data")
     async def get_tx_data(self, value: int = 0):
+        chain_id, gas_price = await get_tx_params(self.w3, self.chain, self.address)
+
         tx = {
-            "chainId": await self.w3.eth.chain_id,
+            "chainId": chain_id,
             "from": self.address,
             "value": value,
-            "gasPrice": await self.w3.eth.gas_price,
-            "nonce": await self.w3.eth.get_transaction_count(self.address),
+            "gasPrice": gas_price,
+            # A set gas keeps build_transaction from running its own eth_estimateGas, sign() sets the real limit
+            "gas": 0,
         }
         return tx
 
@@ -50,22 +65,74 @@ class Account:
 
         if abi is None:
             abi = ERC20_ABI
+        elif isinstance(abi, LazyABI):
+            abi = abi.load()
 
         contract = self.w3.eth.contract(address=contract_address, abi=abi)
 
         return contract
 
+    async def multicall(self, calls: list) -> list:
+        """Run contract function calls in one Multicall3 request, failed calls return None"""
+        return await multicall(self.w3, self.chain, calls)
+
+    async def get_balances(self, token_addresses: List[str]) -> Dict[str, Dict]:
+        """Balances of the tokens in one multicall, tokens that can't be read are left out"""
+        if not token_addresses:
+            return {}
+
+        token_addresses = [self.w3.to_checksum_address(token) for token in token_addresses]
+        unknown = [token for token in token_addresses if (self.chain, token) not in TOKEN_METADATA]
+
+        calls = [self.get_contract(token).functions.balanceOf(self.address) for token in token_addresses]
+
+        for token in unknown:
+            contract = self.get_contract(token)
+            calls.extend([contract.functions.symbol(), contract.functions.decimals()])
+
+        results = await self.multicall(calls)
+
+        for index, token in enumerate(unknown):
+            symbol, decimal = results[len(token_addresses) + index * 2:len(token_addresses) + index * 2 + 2]
+
+            # A failed sub-call is retried next time instead of being kept for the process lifetime
+            if symbol is not None and decimal is not None:
+                TOKEN_METADATA[(self.chain, token)] = (symbol, decimal)
+
+        balances = {}
+
+        for token, balance_wei in zip(token_addresses, results):
+            if balance_wei is None or (self.chain, token) not in TOKEN_METADATA:
+                logger.warning(f"[{self.account_id}][{self.address}] Can't read balance of {token}")
+                continue
+
+            symbol, decimal = TOKEN_METADATA[(self.chain, token)]
+            balance = balance_wei / 10 ** decimal
+
+            balances[token] = {"balance_wei": balance_wei, "balance": balance, "symbol": symbol, "decimal": decimal}
+
+        return balances
+
     async def get_balance(self, contract_address: str) -> Dict:
         contract_address = self.w3.to_checksum_address(contract_address)
-        contract = self.get_contract(contract_address)
+        balances = await self.get_balances([contract_address])
+
+        if contract_address not in balances:
+            raise ValueError(f"Can't read balance of {contract_address}")
 
-        symbol = await contract.functions.symbol().call()
-        decimal = await contract.functions.decimals().call()
-        balance_wei = await contract.functions.balanceOf(self.address).call()
+        return balances[contract_address]
 
-        balance = balance_wei / 10 ** decimal
+    async def get_allowances(self, token_addresses: List[str], spenders: List[str]) -> Dict[Tuple[str, str], int]:
+        pairs = [
+            (self.w3.to_checksum_address(token), self.w3.to_checksum_address(spender))
+            for token in token_addresses for spender in spenders
+        ]
+
+        results = await self.multicall(
+            [self.get_contract(token).functions.allowance(self.address, spender) for token, spender in pairs]
+        )
 
-        return {"balance_wei": balance_wei, "balance": balance, "symbol": symbol, "decimal": decimal}
+        return dict(zip(pairs, results))
 
     async def get_amount(
             self,
@@ -101,15 +168,35 @@ class Account:
         contract = self.w3.eth.contract(address=token_address, abi=ERC20_ABI)
         amount_approved = await contract.functions.allowance(self.address, contract_address).call()
 
+        allowance_cache.set(self.chain, self.address, token_address, contract_address, amount_approved)
+
         return amount_approved
 
-    async def approve(self, amount: int, token_address: str, contract_address: str):
+    @traced("approve")
+    async def approve(
+            self,
+            amount: int,
+            token_address: str,
+            contract_address: str,
+            allowance_amount: int = None,
+            spend: bool = True
+    ):
+        """Approve contract_address for amount if needed, spend=False when no swap follows the approve"""
         token_address = self.w3.to_checksum_address(token_address)
         contract_address = self.w3.to_checksum_address(contract_address)
 
         contract = self.w3.eth.contract(address=token_address, abi=ERC20_ABI)
 
-        allowance_amount = await self.check_allowance(token_address, contract_address)
+        if allowance_amount is not None:
+            allowance_cache.set(self.chain, self.address, token_address, contract_address, allowance_amount)
+        else:
+            cached = allowance_cache.get(self.chain, self.address, token_address, contract_address)
+
+            # Trust the allowance seen by this process only when it covers the amount
+            if ALLOWANCE_CACHE and amount and cached is not None and cached >= amount:
+                allowance_amount = cached
+            else:
+                allowance_amount = await self.check_allowance(token_address, contract_address)
 
         if amount > allowance_amount or amount == 0:
             logger.success(f"[{self.account_id}][{self.address}] Make approve")
@@ -131,39 +218,74 @@ class Account:
 
             await sleep(5, 20)
 
+        if spend:
+            allowance_cache.spend(self.chain, self.address, token_address, contract_address, amount)
+
     async def wait_until_tx_finished(self, hash: str, max_wait_time=180):
-        start_time = time.time()
-        while True:
-            try:
-                receipts = await self.w3.eth.get_transaction_receipt(hash)
-                status = receipts.get("status")
-                if status == 1:
-                    trans_status = f"[{self.account_id}][{self.address}] {self.explorer}{hash} successfully!"
-                    logger.success(trans_status)
-                    return trans_status
-                elif status is None:
-                    await asyncio.sleep(0.3)
-                else:
-                    trans_status = f"[{self.account_id}][{self.address}] {self.explorer}{hash} transaction failed!"
-                    logger.error(trans_status)
-                    return trans_status
-            except TransactionNotFound:
-                if time.time() - start_time > max_wait_time:
-                    print(f'FAILED TX: {hash}')
-                    raise TransactionNotFound(f'TransactionNotFound ERROR: {hash}')
-                await asyncio.sleep(1)
+        try:
+            with span("receipt_wait", tx_hash=hash):
+                receipts = await get_receipt_watcher(self.chain).wait(hash, max_wait_time)
+        except asyncio.TimeoutError:
+            logger.error(f"[{self.account_id}][{self.address}] {self.explorer}{hash} receipt not found in {max_wait_time}s")
+            gas_model.forget(hash)
+            await nonce_manager.resync(self.w3, self.chain, self.address)
+            raise TransactionNotFound(f'TransactionNotFound ERROR: {hash}')
+
+        nonce_manager.confirm(hash)
+        gas_model.record(hash, receipts)
+        allowance_cache.update_from_receipt(self.chain, receipts)
+
+        if receipts.get("status") != 1:
+            # A cached allowance may have been spent or revoked elsewhere, read it from the chain next time
+            allowance_cache.forget_wallet(self.chain, self.address)
+
+        if receipts.get("status") == 1:
+            trans_status = f"[{self.account_id}][{self.address}] {self.explorer}{hash} successfully!"
+            logger.success(trans_status)
+            return trans_status
+        else:
+            trans_status = f"[{self.account_id}][{self.address}] {self.explorer}{hash} transaction failed!"
+            logger.error(trans_status)
+            return trans_status
 
     async def sign(self, transaction):
-        gas = await self.w3.eth.estimate_gas(transaction)
-        gas = int(gas * GAS_MULTIPLIER)
+        gas_key = get_gas_key(self.chain, transaction)
+        gas = gas_model.limit(gas_key) if GAS_MODEL else None
+        estimated = gas is None
+
+        if estimated:
+            transaction.pop("gas", None)
+
+            try:
+                with span("estimate_gas"):
+                    gas = await self.w3.eth.estimate_gas(transaction)
+            except Exception:
+                allowance_cache.forget_wallet(self.chain, self.address)
+                raise
+
+            gas = int(gas * GAS_MULTIPLIER)
+
+        # The nonce is reserved only now, so reservations follow the order transactions are sent in
+        transaction.update({"gas": gas, "nonce": await reserve_nonce(self.w3, self.chain, self.address)})
 
-        transaction.update({"gas": gas})
+        try:
+            with span("sign", gas=gas):
+                signed_txn = await sign_transaction(transaction, self.private_key)
+        except Exception:
+            await nonce_manager.resync(self.w3, self.chain, self.address)
+            raise
 
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
+        nonce_manager.track(signed_txn.hash.hex(), self.chain, self.address, transaction["nonce"])
+        gas_model.track(signed_txn.hash.hex(), gas_key, gas, estimated)
 
         return signed_txn
 
     async def send_raw_transaction(self, signed_txn):
-        txn_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        try:
+            with span("send", tx_hash=signed_txn.hash.hex()):
+                txn_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        except Exception:
+            await nonce_manager.resync(self.w3, self.chain, self.address)
+            raise
 
         return txn_hash
@@ -1,9 +1,9 @@
 from typing import Union, Dict
 
-import aiohttp
 from loguru import logger
 from ..config import INCH_CONTRACT, ZKSYNC_TOKENS
 from ..settings import INCH_API_KEY
+from ..utils import aggregator_client
 from ..utils.gas_checker import check_gas
 from ..utils.helpers import retry
 from .account import Account
@@ -21,7 +21,7 @@ class Inch(Account):
             self.proxy = f"http://{proxy}"
 
     async def build_tx(self, from_token: str, to_token: str, amount: int, slippage: int):
-        url = f"https://api.1inch.dev/swap/v5.2/{await self.w3.eth.chain_id}/swap"
+        url = f"https://api.1inch.dev/swap/v5.2/{await self.get_chain_id()}/swap"
 
         params = {
             "src": self.w3.to_checksum_address(from_token),
@@ -37,12 +37,20 @@ class Inch(Account):
                 "fee": 1
             })
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url, params=params, headers=self.headers, proxy=self.proxy)
+        return await aggregator_client.request("1inch", "GET", url, params=params, headers=self.headers, proxy=self.proxy)
 
-            transaction_data = await response.json()
+    async def get_amount_out(self, from_token: str, to_token: str, amount: int) -> int:
+        url = f"https://api.1inch.dev/swap/v5.2/{await self.get_chain_id()}/quote"
 
-            return transaction_data
+        params = {
+            "src": "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE" if from_token == "ETH" else ZKSYNC_TOKENS[from_token],
+            "dst": "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE" if to_token == "ETH" else ZKSYNC_TOKENS[to_token],
+            "amount": amount,
+        }
+
+        quote_data = await aggregator_client.request("1inch", "GET", url, params=params, headers=self.headers, proxy=self.proxy)
+
+        return int(quote_data["toAmount"])
 
     @retry
     @check_gas
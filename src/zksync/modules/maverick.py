@@ -5,6 +5,7 @@ from loguru import logger
 from ..config import MAVERICK_CONTRACTS, MAVERICK_POSITION_ABI, ZKSYNC_TOKENS, MAVERICK_ROUTER_ABI, ZERO_ADDRESS
 from ..utils.gas_checker import check_gas
 from ..utils.helpers import retry
+from ..utils.tracing import traced
 from .account import Account
 
 
@@ -14,6 +15,7 @@ class Maverick(Account):
 
         self.swap_contract = self.get_contract(MAVERICK_CONTRACTS["router"], MAVERICK_ROUTER_ABI)
 
+    @traced("quote")
     async def get_min_amount_out(self, amount: int, token_a_in: bool, slippage: float):
         contract = self.get_contract(MAVERICK_CONTRACTS["pool_information"], MAVERICK_POSITION_ABI)
 
@@ -34,11 +34,17 @@ class MultiApprove(Account):
         random.shuffle(contract_list)
         random.shuffle(token_list)
 
+        token_list = [token for token in token_list if token not in ["ETH", "WETH"]]
+
+        allowances = await self.get_allowances([ZKSYNC_TOKENS[token] for token in token_list], contract_list)
+
         for contract_address in contract_list:
             for _, token in enumerate(token_list):
-                if token in ["ETH", "WETH"]:
-                    continue
+                allowance_amount = allowances[(
+                    self.w3.to_checksum_address(ZKSYNC_TOKENS[token]),
+                    self.w3.to_checksum_address(contract_address)
+                )]
 
-                await self.approve(amount, ZKSYNC_TOKENS[token], contract_address)
+                await self.approve(amount, ZKSYNC_TOKENS[token], contract_address, allowance_amount, spend=False)
 
                 await sleep(sleep_from, sleep_to)
@@ -4,6 +4,7 @@ from typing import Union
 from loguru import logger
 from ..config import ZKSYNC_TOKENS
 from ..modules import *
+from .quoter import pick_swap_module
 from ..utils.sleeping import sleep
 
 
@@ -27,9 +28,17 @@ class Multiswap(Account):
             "vesync": VeSync
         }
 
-    def get_swap_module(self, use_dex: list):
-        swap_module = random.choice(use_dex)
-        return self.swap_modules[swap_module]
+    async def get_swap_module(self, use_dex: list, from_token: str, to_token: str, amount: int):
+        return await pick_swap_module(
+            self.swap_modules,
+            use_dex,
+            self.account_id,
+            self.private_key,
+            self.proxy,
+            from_token,
+            to_token,
+            amount
+        )
 
     async def swap(
             self,
@@ -64,6 +73,8 @@ class Multiswap(Account):
 
                 min_amount = float(self.w3.from_wei(int(balance / 100 * min_percent), "ether"))
                 max_amount = float(self.w3.from_wei(int(balance / 100 * max_percent), "ether"))
+
+                quote_amount = int(balance / 100 * (min_percent + max_percent) / 2)
             else:
                 decimal = 18
                 to_token = "ETH"
@@ -73,7 +84,10 @@ class Multiswap(Account):
                 min_amount = balance["balance"] if balance["balance"] <= 1 else balance["balance"] / 100 * min_percent
                 max_amount = balance["balance"] if balance["balance"] <= 1 else balance["balance"] / 100 * max_percent
 
-            swap_module = self.get_swap_module(use_dex)(self.account_id, self.private_key, self.proxy)
+                quote_amount = balance["balance_wei"] if balance["balance"] <= 1 \
+                    else int(balance["balance_wei"] / 100 * (min_percent + max_percent) / 2)
+
+            swap_module = await self.get_swap_module(use_dex, token, to_token, quote_amount)
             await swap_module.swap(
                 token,
                 to_token,
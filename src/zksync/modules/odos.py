@@ -1,9 +1,8 @@
-import aiohttp
-
 from typing import Union, Dict
 from loguru import logger
 
 from ..config import ZERO_ADDRESS, ZKSYNC_TOKENS, ODOS_CONTRACT
+from ..utils import aggregator_client
 from ..utils.gas_checker import check_gas
 from ..utils.helpers import retry
 from .account import Account
@@ -22,7 +21,7 @@ class Odos(Account):
         url = "https://api.odos.xyz/sor/quote/v2"
 
         data = {
-            "chainId": await self.w3.eth.chain_id,
+            "chainId": await self.get_chain_id(),
             "inputTokens": [
                 {
                     "tokenAddress": self.w3.to_checksum_address(from_token),
@@ -41,20 +40,22 @@ class Odos(Account):
             "compact": True
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.post(
-                url=url,
-                headers={"Content-Type": "application/json"},
-                json=data,
-                proxy=self.proxy
-            )
+        return await aggregator_client.request(
+            "odos",
+            "POST",
+            url,
+            json=data,
+            headers={"Content-Type": "application/json"},
+            proxy=self.proxy
+        )
+
+    async def get_amount_out(self, from_token: str, to_token: str, amount: int) -> int:
+        from_token = ZERO_ADDRESS if from_token == "ETH" else ZKSYNC_TOKENS[from_token]
+        to_token = ZERO_ADDRESS if to_token == "ETH" else ZKSYNC_TOKENS[to_token]
 
-            if response.status == 200:
-                response_data = await response.json()
+        quote_data = await self.quote(from_token, to_token, amount, 1)
 
-                return response_data
-            else:
-                logger.error(f"[{self.account_id}][{self.address}] Bad Odos request")
+        return int(quote_data["outAmounts"][0])
 
     async def assemble(self, path_id):
         url = "https://api.odos.xyz/sor/assemble"
@@ -65,20 +66,14 @@ class Odos(Account):
             "simulate": False,
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.post(
-                url=url,
-                headers={"Content-Type": "application/json"},
-                json=data,
-                proxy=self.proxy
-            )
-
-            if response.status == 200:
-                response_data = await response.json()
-
-                return response_data
-            else:
-                logger.error(f"[{self.account_id}][{self.address}] Bad Odos request")
+        return await aggregator_client.request(
+            "odos",
+            "POST",
+            url,
+            json=data,
+            headers={"Content-Type": "application/json"},
+            proxy=self.proxy
+        )
 
     @retry
     @check_gas
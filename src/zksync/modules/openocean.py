@@ -1,8 +1,8 @@
 from typing import Union, Dict
 
-import aiohttp
 from loguru import logger
 from ..config import OPENOCEAN_CONTRACT, ZKSYNC_TOKENS
+from ..utils import aggregator_client
 from ..utils.gas_checker import check_gas
 from ..utils.helpers import retry
 from .account import Account
@@ -24,7 +24,7 @@ class OpenOcean(Account):
             "inTokenAddress": self.w3.to_checksum_address(from_token),
             "outTokenAddress": self.w3.to_checksum_address(to_token),
             "amount": float(amount),
-            "gasPrice": float(self.w3.from_wei(await self.w3.eth.gas_price, "gwei")),
+            "gasPrice": float(self.w3.from_wei(await self.get_gas_price(), "gwei")),
             "slippage": slippage,
             "account": self.address,
         }
@@ -35,12 +35,24 @@ class OpenOcean(Account):
                 "referrerFee": 1
             })
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params, proxy=self.proxy)
+        return await aggregator_client.request("openocean", "GET", url, params=params, proxy=self.proxy)
 
-            transaction_data = await response.json()
+    async def get_amount_out(self, from_token: str, to_token: str, amount: int) -> int:
+        url = "https://open-api.openocean.finance/v3/324/quote"
 
-            return transaction_data
+        # OpenOcean takes the amount in token units, not in wei
+        decimal = 18 if from_token == "ETH" else (await self.get_balance(ZKSYNC_TOKENS[from_token]))["decimal"]
+
+        params = {
+            "inTokenAddress": "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE" if from_token == "ETH" else ZKSYNC_TOKENS[from_token],
+            "outTokenAddress": "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE" if to_token == "ETH" else ZKSYNC_TOKENS[to_token],
+            "amount": amount / 10 ** decimal,
+            "gasPrice": float(self.w3.from_wei(await self.get_gas_price(), "gwei")),
+        }
+
+        quote_data = await aggregator_client.request("openocean", "GET", url, params=params, proxy=self.proxy)
+
+        return int(quote_data["data"]["outAmount"])
 
     @retry
     @check_gas
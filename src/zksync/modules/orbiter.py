@@ -1,8 +1,8 @@
 from typing import Union
 
-import aiohttp
 from loguru import logger
 
+from ..utils import aggregator_client
 from ..utils.gas_checker import check_gas
 from ..utils.helpers import retry
 from .account import Account
@@ -37,24 +37,23 @@ class Orbiter(Account):
             "params": [f"{self.chain_ids[from_chain]}-{self.chain_ids[to_chain]}:ETH-ETH", float(amount)]
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.post(
-                url=url,
-                headers={"Content-Type": "application/json"},
-                json=data,
-            )
-
-            response_data = await response.json()
+        response_data = await aggregator_client.request(
+            "orbiter",
+            "POST",
+            url,
+            json=data,
+            headers={"Content-Type": "application/json"}
+        )
 
-            if response_data.get("result").get("error", None) is None:
-                return int(response_data.get("result").get("_sendValue"))
+        if response_data.get("result").get("error", None) is None:
+            return int(response_data.get("result").get("_sendValue"))
 
-            else:
-                error_data = response_data.get("result").get("error")
+        else:
+            error_data = response_data.get("result").get("error")
 
-                logger.error(f"[{self.account_id}][{self.address}] Orbiter error | {error_data}")
+            logger.error(f"[{self.account_id}][{self.address}] Orbiter error | {error_data}")
 
-                return False
+            return False
 
     @retry
     @check_gas
@@ -5,6 +5,8 @@ from loguru import logger
 
 from ..utils.gas_checker import check_gas
 from ..utils.helpers import retry
+from ..utils.pool_registry import PANCAKE_POOL_FEE, pool_key, pool_registry
+from ..utils.tracing import traced
 from .account import Account
 
 from ..config import (
@@ -26,14 +28,18 @@ class Pancake(Account):
     async def get_pool(self, from_token: str, to_token: str):
         factory = self.get_contract(PANCAKE_CONTRACTS["factory"], PANCAKE_FACTORY_ABI)
 
-        pool = await factory.functions.getPool(
-            self.w3.to_checksum_address(ZKSYNC_TOKENS[from_token]),
-            self.w3.to_checksum_address(ZKSYNC_TOKENS[to_token]),
-            500
-        ).call()
+        pool = await pool_registry.resolve(
+            pool_key("pancake", ZKSYNC_TOKENS[from_token], ZKSYNC_TOKENS[to_token], PANCAKE_POOL_FEE),
+            factory.functions.getPool(
+                self.w3.to_checksum_address(ZKSYNC_TOKENS[from_token]),
+                self.w3.to_checksum_address(ZKSYNC_TOKENS[to_token]),
+                PANCAKE_POOL_FEE
+            ).call
+        )
 
         return pool
 
+    @traced("quote")
     async def get_min_amount_out(self, from_token: str, to_token: str, amount: int, slippage: float):
         quoter = self.get_contract(PANCAKE_CONTRACTS["quoter"], PANCAKE_QUOTER_ABI)
 
@@ -47,6 +53,9 @@ class Pancake(Account):
 
         return int(quoter_data[0] - (quoter_data[0] / 100 * slippage))
 
+    async def get_amount_out(self, from_token: str, to_token: str, amount: int) -> int:
+        return await self.get_min_amount_out(from_token, to_token, amount, 0)
+
     async def swap_to_token(self, from_token: str, to_token: str, amount: int, slippage: int):
         tx_data = await self.get_tx_data(amount)
 
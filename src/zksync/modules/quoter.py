@@ -0,0 +1,108 @@
+import asyncio
+import random
+import time
+from typing import Dict, List, NamedTuple, Union
+
+from loguru import logger
+
+from ..settings import QUOTE_DEADLINE, QUOTE_RANK_BY
+from ..utils.tracing import traced
+from .account import Account
+
+
+class SwapQuote(NamedTuple):
+    name: str
+    module: Account
+    amount_out: int
+    latency: float
+
+
+async def timed_quote(name: str, module: Account, from_token: str, to_token: str, amount: int) -> SwapQuote:
+    start = time.perf_counter()
+
+    amount_out = await module.get_amount_out(from_token, to_token, amount)
+
+    return SwapQuote(name, module, amount_out, time.perf_counter() - start)
+
+
+@traced("quote")
+async def rank_swap_modules(
+        swap_modules: Dict[str, type],
+        use_dex: List[str],
+        account_id: int,
+        private_key: str,
+        proxy: Union[None, str],
+        from_token: str,
+        to_token: str,
+        amount: int,
+        deadline: float = QUOTE_DEADLINE
+) -> List[SwapQuote]:
+    """
+    Ask every DEX from use_dex that can quote for amount_out at once and wait at most deadline seconds.
+    Venues that fail or miss the deadline are dropped, the rest are ranked by QUOTE_RANK_BY.
+    """
+    modules = {name: swap_modules[name](account_id, private_key, proxy) for name in use_dex}
+
+    tasks = [
+        asyncio.create_task(timed_quote(name, module, from_token, to_token, amount))
+        for name, module in modules.items() if hasattr(module, "get_amount_out")
+    ]
+
+    if not tasks:
+        return []
+
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+
+    for task in pending:
+        task.cancel()
+
+    # Cancelled quotes must finish before their sessions and tasks are dropped
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    quotes = []
+
+    for task in done:
+        if task.exception() is not None:
+            logger.warning(f"[{account_id}] Quote failed | {task.exception()}")
+        elif task.result().amount_out > 0:
+            quotes.append(task.result())
+
+    if QUOTE_RANK_BY == "latency":
+        return sorted(quotes, key=lambda quote: quote.latency)
+
+    return sorted(quotes, key=lambda quote: (-quote.amount_out, quote.latency))
+
+
+async def pick_swap_module(
+        swap_modules: Dict[str, type],
+        use_dex: List[str],
+        account_id: int,
+        private_key: str,
+        proxy: Union[None, str],
+        from_token: str,
+        to_token: str,
+        amount: int
+) -> Account:
+    """
+    Venue for the swap. Venues without get_amount_out keep their share of the random rotation,
+    otherwise the best quoted venue wins, a random one from use_dex when nothing could be quoted.
+    """
+    choice = random.choice(use_dex)
+
+    if not hasattr(swap_modules[choice], "get_amount_out"):
+        return swap_modules[choice](account_id, private_key, proxy)
+
+    quotable = [name for name in use_dex if hasattr(swap_modules[name], "get_amount_out")]
+    quotes = await rank_swap_modules(
+        swap_modules, quotable, account_id, private_key, proxy, from_token, to_token, amount
+    )
+
+    if quotes:
+        logger.info(
+            f"[{account_id}] Quotes {from_token} -> {to_token} | " +
+            ", ".join(f"{quote.name}: {quote.amount_out} ({quote.latency:.2f}s)" for quote in quotes)
+        )
+        return quotes[0].module
+
+    return swap_modules[random.choice(use_dex)](account_id, private_key, proxy)
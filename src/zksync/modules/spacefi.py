@@ -5,6 +5,7 @@ from loguru import logger
 from ..config import SPACEFI_ROUTER_ABI, SPACEFI_CONTRACTS, ZKSYNC_TOKENS
 from ..utils.gas_checker import check_gas
 from ..utils.helpers import retry
+from ..utils.tracing import traced
 from .account import Account
 
 
@@ -14,6 +15,7 @@ class SpaceFi(Account):
 
         self.swap_contract = self.get_contract(SPACEFI_CONTRACTS["router"], SPACEFI_ROUTER_ABI)
 
+    @traced("quote")
     async def get_min_amount_out(self, from_token: str, to_token: str, amount: int, slippage: float):
         min_amount_out = await self.swap_contract.functions.getAmountsOut(
             amount,
@@ -24,6 +26,9 @@ class SpaceFi(Account):
         ).call()
         return int(min_amount_out[1] - (min_amount_out[1] / 100 * slippage))
 
+    async def get_amount_out(self, from_token: str, to_token: str, amount: int) -> int:
+        return await self.get_min_amount_out(ZKSYNC_TOKENS[from_token], ZKSYNC_TOKENS[to_token], amount, 0)
+
     async def swap_to_token(self, from_token: str, to_token: str, amount: int, slippage: int):
         tx_data = await self.get_tx_data(amount)
 
@@ -4,6 +4,7 @@ from typing import Union, List
 from loguru import logger
 from ..config import ZKSYNC_TOKENS
 from ..modules import *
+from .quoter import pick_swap_module
 from ..utils.sleeping import sleep
 
 
@@ -27,9 +28,17 @@ class SwapTokens(Account):
             "vesync": VeSync
         }
 
-    def get_swap_module(self, use_dex: list):
-        swap_module = random.choice(use_dex)
-        return self.swap_modules[swap_module]
+    async def get_swap_module(self, use_dex: list, from_token: str, to_token: str, amount: int):
+        return await pick_swap_module(
+            self.swap_modules,
+            use_dex,
+            self.account_id,
+            self.private_key,
+            self.proxy,
+            from_token,
+            to_token,
+            amount
+        )
 
     async def swap(
             self,
@@ -45,14 +54,18 @@ class SwapTokens(Account):
 
         logger.info(f"[{self.account_id}][{self.address}] Start swap tokens")
 
+        balances = await self.get_balances([ZKSYNC_TOKENS[token] for token in tokens if token != "ETH"])
+
         for _, token in enumerate(tokens, start=1):
             if token == "ETH":
                 continue
 
-            balance = await self.get_balance(ZKSYNC_TOKENS[token])
+            balance = balances.get(self.w3.to_checksum_address(ZKSYNC_TOKENS[token]))
+
+            if balance is not None and balance["balance_wei"] > 0:
+                quote_amount = int(balance["balance_wei"] / 100 * (min_percent + max_percent) / 2)
 
-            if balance["balance_wei"] > 0:
-                swap_module = self.get_swap_module(use_dex)(self.account_id, self.private_key, self.proxy)
+                swap_module = await self.get_swap_module(use_dex, token, "ETH", quote_amount)
                 await swap_module.swap(
                     token,
                     "ETH",
@@ -10,8 +10,12 @@ from ..config import (
     SYNCSWAP_ROUTER_ABI,
     SYNCSWAP_CLASSIC_POOL_DATA_ABI
 )
+from ..settings import SYNCSWAP_LOCAL_QUOTE, SYNCSWAP_QUOTE_CROSS_CHECK, SYNCSWAP_QUOTE_TOLERANCE
+from ..utils.amm import reserves_cache
 from ..utils.gas_checker import check_gas
 from ..utils.helpers import retry
+from ..utils.pool_registry import pool_key, pool_registry
+from ..utils.tracing import traced
 from .account import Account
 from eth_abi import abi
 
@@ -25,24 +29,57 @@ class SyncSwap(Account):
     async def get_pool(self, from_token: str, to_token: str):
         contract = self.get_contract(SYNCSWAP_CONTRACTS["classic_pool"], SYNCSWAP_CLASSIC_POOL_ABI)
 
-        pool_address = await contract.functions.getPool(
-            self.w3.to_checksum_address(ZKSYNC_TOKENS[from_token]),
-            self.w3.to_checksum_address(ZKSYNC_TOKENS[to_token])
-        ).call()
+        pool_address = await pool_registry.resolve(
+            pool_key("syncswap", ZKSYNC_TOKENS[from_token], ZKSYNC_TOKENS[to_token]),
+            contract.functions.getPool(
+                self.w3.to_checksum_address(ZKSYNC_TOKENS[from_token]),
+                self.w3.to_checksum_address(ZKSYNC_TOKENS[to_token])
+            ).call
+        )
 
         return pool_address
 
-    async def get_min_amount_out(self, pool_address: str, token_address: str, amount: int, slippage: float):
+    async def get_onchain_amount_out(self, pool_address: str, token_address: str, amount: int) -> int:
         pool_contract = self.get_contract(pool_address, SYNCSWAP_CLASSIC_POOL_DATA_ABI)
 
-        min_amount_out = await pool_contract.functions.getAmountOut(
+        return await pool_contract.functions.getAmountOut(
             token_address,
             amount,
             self.address
         ).call()
 
+    @traced("quote")
+    async def get_min_amount_out(self, pool_address: str, token_address: str, amount: int, slippage: float):
+        if not SYNCSWAP_LOCAL_QUOTE:
+            min_amount_out = await self.get_onchain_amount_out(pool_address, token_address, amount)
+
+            return int(min_amount_out - (min_amount_out / 100 * slippage))
+
+        min_amount_out = (await reserves_cache.quote(
+            self.w3, self.chain, pool_address, token_address, [amount], self.address
+        ))[0]
+
+        if SYNCSWAP_QUOTE_CROSS_CHECK:
+            onchain_amount_out = await self.get_onchain_amount_out(pool_address, token_address, amount)
+
+            if abs(onchain_amount_out - min_amount_out) > onchain_amount_out * SYNCSWAP_QUOTE_TOLERANCE:
+                logger.warning(
+                    f"[{self.account_id}][{self.address}] SyncSwap local quote {min_amount_out} "
+                    f"differs from on-chain {onchain_amount_out}"
+                )
+
+            min_amount_out = min(min_amount_out, onchain_amount_out)
+
         return int(min_amount_out - (min_amount_out / 100 * slippage))
 
+    async def get_amount_out(self, from_token: str, to_token: str, amount: int) -> int:
+        pool_address = await self.get_pool(from_token, to_token)
+
+        if pool_address == ZERO_ADDRESS:
+            raise ValueError(f"SyncSwap pool {from_token}/{to_token} not found")
+
+        return await self.get_min_amount_out(pool_address, ZKSYNC_TOKENS[from_token], amount, 0)
+
     @retry
     @check_gas
     async def swap(
@@ -76,13 +113,11 @@ class SyncSwap(Account):
         pool_address = await self.get_pool(from_token, to_token)
 
         if pool_address != ZERO_ADDRESS:
-            tx_data = await self.get_tx_data()
-
-            if from_token == "ETH":
-                tx_data.update({"value": amount_wei})
-            else:
+            if from_token != "ETH":
                 await self.approve(amount_wei, token_address, self.w3.to_checksum_address(SYNCSWAP_CONTRACTS["router"]))
 
+            tx_data = await self.get_tx_data(amount_wei if from_token == "ETH" else 0)
+
             min_amount_out = await self.get_min_amount_out(pool_address, token_address, amount_wei, slippage)
 
             steps = [{
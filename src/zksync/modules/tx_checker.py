@@ -1,22 +1,17 @@
 import asyncio
-import random
 
 from eth_typing import ChecksumAddress
 from loguru import logger
-from web3 import Web3, AsyncHTTPProvider
-from web3.eth import AsyncEth
+from web3 import AsyncWeb3
 from eth_account import Account as EthereumAccount
 from tabulate import tabulate
 
-from ..config import ACCOUNTS, RPC
+from .. import config
+from ..utils.providers import get_provider
 
 
 async def get_nonce(address: ChecksumAddress):
-    web3 = Web3(
-        AsyncHTTPProvider(random.choice(RPC["zksync"]["rpc"])),
-        modules={"eth": (AsyncEth,)},
-        middlewares=[],
-    )
+    web3 = AsyncWeb3(get_provider("zksync"), middlewares=[])
 
     nonce = await web3.eth.get_transaction_count(address)
 
@@ -28,7 +23,7 @@ async def check_tx():
 
     logger.info("Start transaction checker")
 
-    for _id, pk in enumerate(ACCOUNTS, start=1):
+    for _id, pk in enumerate(config.ACCOUNTS, start=1):
         account = EthereumAccount.from_key(pk)
 
         tasks.append(asyncio.create_task(get_nonce(account.address), name=account.address))
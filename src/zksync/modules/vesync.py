@@ -5,6 +5,7 @@ from loguru import logger
 from ..config import VESYNC_ROUTER_ABI, VESYNC_CONTRACTS, ZKSYNC_TOKENS
 from ..utils.gas_checker import check_gas
 from ..utils.helpers import retry
+from ..utils.tracing import traced
 from .account import Account
 
 
@@ -14,6 +15,7 @@ class VeSync(Account):
 
         self.swap_contract = self.get_contract(VESYNC_CONTRACTS["router"], VESYNC_ROUTER_ABI)
 
+    @traced("quote")
     async def get_min_amount_out(self, from_token: str, to_token: str, amount: int, slippage: float):
         min_amount_out = await self.swap_contract.functions.getAmountOut(
             amount,
@@ -4,6 +4,7 @@ from loguru import logger
 from ..config import WOOFI_CONTRACTS, WOOFI_ROUTER_ABI, ZKSYNC_TOKENS
 from ..utils.gas_checker import check_gas
 from ..utils.helpers import retry
+from ..utils.tracing import traced
 from .account import Account
 
 
@@ -13,6 +14,7 @@ class WooFi(Account):
 
         self.swap_contract = self.get_contract(WOOFI_CONTRACTS["router"], WOOFI_ROUTER_ABI)
 
+    @traced("quote")
     async def get_min_amount_out(self, from_token: str, to_token: str, amount: int, slippage: float):
         min_amount_out = await self.swap_contract.functions.querySwap(
             self.w3.to_checksum_address(from_token),
@@ -49,19 +51,17 @@ class WooFi(Account):
             f"[{self.account_id}][{self.address}] Swap on WooFi – {from_token} -> {to_token} | {amount} {from_token}"
         )
 
-        tx_data = await self.get_tx_data()
-
         if from_token == "ETH":
             from_token_address = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
             to_token_address = self.w3.to_checksum_address(ZKSYNC_TOKENS[to_token])
-            
-            tx_data.update({"value": amount_wei})
         else:
             from_token_address = self.w3.to_checksum_address(ZKSYNC_TOKENS[from_token])
             to_token_address = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
 
             await self.approve(amount_wei, from_token_address, WOOFI_CONTRACTS["router"])
 
+        tx_data = await self.get_tx_data(amount_wei if from_token == "ETH" else 0)
+
         min_amount_out = await self.get_min_amount_out(from_token_address, to_token_address, amount_wei, slippage)
 
         contract_txn = await self.swap_contract.functions.swap(
@@ -1,8 +1,8 @@
 from typing import Union, Dict
 
-import aiohttp
 from loguru import logger
 from ..config import XYSWAP_CONTRACT, ZKSYNC_TOKENS
+from ..utils import aggregator_client
 from ..utils.gas_checker import check_gas
 from ..utils.helpers import retry
 from .account import Account
@@ -21,29 +21,27 @@ class XYSwap(Account):
         url = "https://aggregator-api.xy.finance/v1/quote"
 
         params = {
-            "srcChainId": await self.w3.eth.chain_id,
+            "srcChainId": await self.get_chain_id(),
             "srcQuoteTokenAddress": self.w3.to_checksum_address(from_token),
             "srcQuoteTokenAmount": amount,
-            "dstChainId": await self.w3.eth.chain_id,
+            "dstChainId": await self.get_chain_id(),
             "dstQuoteTokenAddress": self.w3.to_checksum_address(to_token),
             "slippage": slippage
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params, proxy=self.proxy)
+        # Only the route provider is taken from the quote, close amounts can share it
+        cache_key = aggregator_client.quote_key("xyswap", params["srcChainId"], from_token, to_token, amount)
 
-            transaction_data = await response.json()
-
-            return transaction_data
+        return await aggregator_client.request("xyswap", "GET", url, params=params, proxy=self.proxy, cache_key=cache_key)
 
     async def build_transaction(self, from_token: str, to_token: str, amount: int, slippage: float, swap_provider: str):
         url = "https://aggregator-api.xy.finance/v1/buildTx"
 
         params = {
-            "srcChainId": await self.w3.eth.chain_id,
+            "srcChainId": await self.get_chain_id(),
             "srcQuoteTokenAddress": self.w3.to_checksum_address(from_token),
             "srcQuoteTokenAmount": amount,
-            "dstChainId": await self.w3.eth.chain_id,
+            "dstChainId": await self.get_chain_id(),
             "dstQuoteTokenAddress": self.w3.to_checksum_address(to_token),
             "slippage": slippage,
             "receiver": self.address,
@@ -56,12 +54,17 @@ class XYSwap(Account):
                 "commissionRate": 10000
             })
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params, proxy=self.proxy)
+        return await aggregator_client.request("xyswap", "GET", url, params=params, proxy=self.proxy)
 
-            transaction_data = await response.json()
+    async def get_amount_out(self, from_token: str, to_token: str, amount: int) -> int:
+        quote = await self.get_quote(
+            "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE" if from_token == "ETH" else ZKSYNC_TOKENS[from_token],
+            "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE" if to_token == "ETH" else ZKSYNC_TOKENS[to_token],
+            amount,
+            1
+        )
 
-            return transaction_data
+        return int(quote["routes"][0]["dstQuoteTokenAmount"])
 
     @retry
     @check_gas
@@ -18,6 +18,9 @@ USE_PROXY = False
 # GWEI CONTROL MODE
 CHECK_GWEI = True  # True or False
 MAX_GWEI = 40
+GAS_CHECK_INTERVAL = 60  # Second, how often the shared gas oracle samples while gas is high
+GAS_RELEASE_BATCH = 20  # Jobs released at once when gas drops
+GAS_RELEASE_INTERVAL = 5  # Second, pause between released batches
 
 GAS_MULTIPLIER = 0.8
 
@@ -26,3 +29,82 @@ RETRY_COUNT = 3
 
 # INCH API KEY
 INCH_API_KEY = ""
+
+# RPC CONNECTION POOL
+RPC_POOL_LIMIT = 100  # Total keep-alive connections shared by all jobs
+RPC_POOL_LIMIT_PER_HOST = 30
+RPC_KEEPALIVE_TIMEOUT = 30  # Second
+RPC_TIMEOUT = 30  # Second
+GAS_PRICE_TTL = 3  # Second, gas price is shared between jobs for this time
+
+# RECEIPT WATCHER
+RECEIPT_POLL_MIN = 0.3  # Second, poll interval right after a new block
+RECEIPT_POLL_MAX = 5  # Second, upper bound of the backoff while no block arrives
+
+# RPC ENDPOINT POOL
+RPC_FAILOVER = 3  # How many endpoints one call may try
+RPC_HEDGE = True  # Duplicate slow reads to the second best endpoint
+RPC_HEDGE_MIN_DELAY = 0.1  # Second, never hedge before this delay
+RPC_DOWN_ERRORS = 3  # Errors in a row before an endpoint is marked down
+RPC_DOWN_TIME = 60  # Second
+
+# TRANSACTION SIGNING
+SIGNER_POOL = "thread"  # thread or process
+SIGNER_WORKERS = 4
+
+# LEARNED GAS LIMIT
+GAS_MODEL = True  # Serve gas limit from estimates that confirmed before instead of estimate_gas
+GAS_MODEL_MIN_SAMPLES = 5
+GAS_MODEL_SAMPLES = 50
+GAS_MODEL_PERCENTILE = 0.95
+GAS_MODEL_MARGIN = 0.2
+GAS_MODEL_MAX_SPREAD = 1.5  # max/min estimate above this counts as an outlier shape
+
+# ALLOWANCE CACHE
+ALLOWANCE_CACHE = True  # Skip allowance() call when the allowance seen by this process covers the amount
+
+# AGGREGATOR API CLIENT
+AGGREGATOR_POOL_LIMIT = 50
+AGGREGATOR_TIMEOUT = 30
+# host: (requests per second, burst)
+AGGREGATOR_RATE_LIMITS = {
+    "api.odos.xyz": (5, 10),
+    "api.1inch.dev": (1, 1),
+    "open-api.openocean.finance": (2, 5),
+    "aggregator-api.xy.finance": (5, 10),
+    "openapi.orbiter.finance": (5, 10),
+    "refuel.socket.tech": (2, 5),
+}
+AGGREGATOR_DEFAULT_RATE_LIMIT = (5, 10)
+QUOTE_CACHE_TTL = 10
+
+# MULTI-DEX QUOTES
+QUOTE_DEADLINE = 5  # seconds to wait for DEX quotes before picking a venue
+QUOTE_RANK_BY = "amount"  # amount - best output, latency - fastest venue
+
+# SYNCSWAP LOCAL QUOTES
+SYNCSWAP_LOCAL_QUOTE = True  # Compute min amount out from cached pool reserves
+SYNCSWAP_QUOTE_CROSS_CHECK = False  # Also call getAmountOut on chain and keep the lower result
+SYNCSWAP_QUOTE_TOLERANCE = 0.005  # Log when local and on-chain quotes differ by more than this
+RESERVES_TTL = 1  # seconds, about one zkSync block
+
+# RETRY POLICY
+RETRY_ON = {"transient", "nonce"}  # error kinds to retry: transient, nonce, unconfirmed, revert, business
+RETRY_BASE_DELAY = 2
+RETRY_MAX_DELAY = 30
+CIRCUIT_FAILURES = 5  # failures in a row before an aggregator API is skipped
+CIRCUIT_OPEN_TIME = 60
+
+# TASK RECOVERY
+TASK_LEASE = 3600  # Second, a RUNNING task older than this is marked FAILED at startup
+
+# DRY RUN
+DRY_RUN = True  # zk_main reports success without running the module
+
+# TRACING
+TRACING = False  # Export timed spans of every run_bot job, task and transaction step
+TRACE_FILE = "traces.jsonl"  # JSON lines of Zipkin v2 spans, one file per process (traces.<pid>.jsonl), empty to disable
+TRACE_FILE_MAX_BYTES = 50 * 1024 * 1024  # the file is rotated at this size
+TRACE_FILE_BACKUPS = 3  # rotated files kept per process
+TRACE_COLLECTOR = ""  # Zipkin v2 endpoint, e.g. http://localhost:9411/api/v2/spans
+TRACE_BATCH_SIZE = 50  # spans buffered before a write
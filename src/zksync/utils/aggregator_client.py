@@ -0,0 +1,186 @@
+import asyncio
+import time
+from typing import Any, Dict, Hashable, Tuple, Union
+from urllib.parse import urlparse
+
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+from loguru import logger
+
+from ..settings import (
+    AGGREGATOR_POOL_LIMIT,
+    AGGREGATOR_TIMEOUT,
+    AGGREGATOR_RATE_LIMITS,
+    AGGREGATOR_DEFAULT_RATE_LIMIT,
+    QUOTE_CACHE_TTL
+)
+from .circuit_breaker import get_breaker
+from .metrics import AGGREGATOR_LATENCY
+from .tracing import span
+
+_session: Union[None, ClientSession] = None
+
+_buckets: Dict[str, "TokenBucket"] = {}
+
+_cache: Dict[Hashable, Tuple[float, Any]] = {}
+
+
+class AggregatorError(Exception):
+    """Non-200 answer or transport failure of an aggregator/bridge API"""
+
+    def __init__(self, api: str, status: Union[None, int], message: str, circuit_open: bool = False) -> None:
+        self.api = api
+        self.status = status
+        self.message = message
+        self.circuit_open = circuit_open
+
+        super().__init__(f"{api} API error | status {status} | {message}")
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.status == 429
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                pause = self.paused_until - time.monotonic()
+
+                if pause > 0:
+                    await asyncio.sleep(pause)
+
+                self.refill()
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        # The API answered 429, stop every caller of this host for a while
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+def get_bucket(host: str) -> TokenBucket:
+    if host not in _buckets:
+        _buckets[host] = TokenBucket(*AGGREGATOR_RATE_LIMITS.get(host, AGGREGATOR_DEFAULT_RATE_LIMIT))
+
+    return _buckets[host]
+
+
+async def get_session() -> ClientSession:
+    global _session
+
+    if _session is None or _session.closed:
+        connector = TCPConnector(limit=AGGREGATOR_POOL_LIMIT, ttl_dns_cache=300)
+        _session = ClientSession(connector=connector, timeout=ClientTimeout(total=AGGREGATOR_TIMEOUT))
+
+    return _session
+
+
+def amount_bucket(amount: int, digits: int = 3) -> int:
+    """Round the amount to a few significant digits so close amounts share one cached quote"""
+    if amount <= 0:
+        return amount
+
+    scale = 10 ** max(len(str(amount)) - digits, 0)
+
+    return amount // scale * scale
+
+
+def quote_key(api: str, chain: Union[int, str], from_token: str, to_token: str, amount: int) -> tuple:
+    return api, chain, from_token.lower(), to_token.lower(), amount_bucket(amount)
+
+
+async def request(
+        api: str,
+        method: str,
+        url: str,
+        params: dict = None,
+        json: Any = None,
+        headers: dict = None,
+        proxy: Union[None, str] = None,
+        cache_key: Hashable = None,
+        ttl: float = QUOTE_CACHE_TTL
+) -> Any:
+    """
+    Send a request through the shared aggregator session, rate limited per host.
+    Pass cache_key to serve repeated requests from a short-lived cache.
+    Raises AggregatorError instead of returning None on failure.
+    """
+    if cache_key is not None:
+        cached = _cache.get(cache_key)
+
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
+    with span("aggregator", api=api, path=urlparse(url).path):
+        breaker = get_breaker(api)
+
+        if breaker.is_open:
+            raise AggregatorError(api, None, "circuit open after repeated failures", circuit_open=True)
+
+        bucket = get_bucket(urlparse(url).hostname)
+        await bucket.acquire()
+
+        session = await get_session()
+
+        status = "error"
+        start = time.perf_counter()
+
+        try:
+            async with session.request(method, url, params=params, json=json, headers=headers, proxy=proxy or None) as response:
+                status = str(response.status)
+
+                if response.status != 200:
+                    error = AggregatorError(api, response.status, (await response.text())[:300])
+
+                    if error.rate_limited:
+                        retry_after = response.headers.get("Retry-After", "")
+                        bucket.pause(float(retry_after) if retry_after.isdigit() else 1 / bucket.rate)
+                        logger.warning(f"{api} API rate limit, pausing {urlparse(url).hostname}")
+
+                    if error.rate_limited or error.status >= 500:
+                        breaker.failure()
+
+                    raise error
+
+                data = await response.json(content_type=None)
+        except (ClientError, asyncio.TimeoutError) as e:
+            breaker.failure()
+            raise AggregatorError(api, None, str(e) or type(e).__name__) from e
+        finally:
+            AGGREGATOR_LATENCY.labels(api, status).observe(time.perf_counter() - start)
+
+        breaker.success()
+
+        if cache_key is not None:
+            _cache[cache_key] = (time.monotonic(), data)
+
+        return data
+
+
+async def close_session():
+    global _session
+
+    _cache.clear()
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+
+    _session = None
@@ -0,0 +1,62 @@
+from typing import Dict, Tuple, Union
+
+AllowanceKey = Tuple[str, str, str, str]
+
+# keccak("Approval(address,address,uint256)")
+APPROVAL_TOPIC = "0x8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925"
+
+
+def topic_address(topic: Union[str, bytes]) -> str:
+    topic = topic.hex() if isinstance(topic, bytes) else topic
+
+    return "0x" + topic[-40:].lower()
+
+
+class AllowanceCache:
+    """
+    Last known allowance per (chain, wallet, token, spender), kept per process only.
+    Values come from allowance() calls and Approval logs of receipts seen by this process,
+    swaps subtract what they spend. Spends and revokes made elsewhere (another worker, another
+    wallet client) are not seen, so every entry of a wallet is dropped when one of its
+    transactions fails and the next approve reads the chain again.
+    """
+
+    def __init__(self) -> None:
+        self.allowances: Dict[AllowanceKey, int] = {}
+
+    @staticmethod
+    def key(chain: str, wallet: str, token: str, spender: str) -> AllowanceKey:
+        return chain, wallet.lower(), token.lower(), spender.lower()
+
+    def get(self, chain: str, wallet: str, token: str, spender: str) -> Union[None, int]:
+        return self.allowances.get(self.key(chain, wallet, token, spender))
+
+    def set(self, chain: str, wallet: str, token: str, spender: str, amount: int):
+        self.allowances[self.key(chain, wallet, token, spender)] = amount
+
+    def spend(self, chain: str, wallet: str, token: str, spender: str, amount: int):
+        allowance = self.get(chain, wallet, token, spender)
+
+        if allowance is not None:
+            self.set(chain, wallet, token, spender, max(allowance - amount, 0))
+
+    def update_from_receipt(self, chain: str, receipt: dict):
+        for log in receipt.get("logs") or []:
+            topics = log.get("topics") or []
+
+            if len(topics) != 3 or (topics[0].hex() if isinstance(topics[0], bytes) else topics[0]) != APPROVAL_TOPIC:
+                continue
+
+            data = log["data"].hex() if isinstance(log["data"], bytes) else log["data"]
+
+            self.set(chain, topic_address(topics[1]), log["address"], topic_address(topics[2]), int(data, 16))
+
+    def forget_wallet(self, chain: str, wallet: str):
+        wallet = wallet.lower()
+
+        self.allowances = {
+            key: amount for key, amount in self.allowances.items() if key[0] != chain or key[1] != wallet
+        }
+
+
+allowance_cache = AllowanceCache()
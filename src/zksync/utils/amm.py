@@ -0,0 +1,145 @@
+import asyncio
+import time
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from web3 import AsyncWeb3
+
+from ..config import SYNCSWAP_CLASSIC_POOL_DATA_ABI, ZERO_ADDRESS
+from ..settings import RESERVES_TTL
+from .multicall import multicall
+
+# SyncSwap fees are expressed in 1e5 units, 300 = 0.3%
+SYNCSWAP_MAX_FEE = 100_000
+
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee: int) -> int:
+    """Constant-product output of a SyncSwap classic pool, same integer math as the contract"""
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+
+    amount_in_with_fee = amount_in * (SYNCSWAP_MAX_FEE - fee)
+
+    return amount_in_with_fee * reserve_out // (reserve_in * SYNCSWAP_MAX_FEE + amount_in_with_fee)
+
+
+def get_amounts_out(amounts_in: Sequence[int], reserve_in: int, reserve_out: int, fee: int) -> List[int]:
+    """Quote many input amounts against one reserves snapshot"""
+    return [get_amount_out(amount_in, reserve_in, reserve_out, fee) for amount_in in amounts_in]
+
+
+class PoolState(NamedTuple):
+    token0: str
+    token1: str
+    reserve0: int
+    reserve1: int
+    updated: float
+
+
+class SwapFees(NamedTuple):
+    fee0: int  # token0 -> token1
+    fee1: int  # token1 -> token0
+    updated: float
+
+
+class ReservesCache:
+    """
+    Reserves and swap fees of SyncSwap classic pools.
+    A snapshot is reused for RESERVES_TTL seconds (about one zkSync block), refresh() reloads
+    any number of pools in one multicall. Reserves are shared by all wallets, fees are read
+    per sender because the fee manager may discount some accounts.
+    """
+
+    def __init__(self) -> None:
+        self.states: Dict[str, PoolState] = {}
+        self.fees: Dict[Tuple[str, str], SwapFees] = {}
+        self.lock = asyncio.Lock()
+
+    def is_fresh(self, pool: str, sender: str = ZERO_ADDRESS) -> bool:
+        state = self.states.get(pool)
+        fees = self.fees.get((pool, sender.lower()))
+        now = time.monotonic()
+
+        return (
+            state is not None and now - state.updated < RESERVES_TTL and
+            fees is not None and now - fees.updated < RESERVES_TTL
+        )
+
+    async def refresh(self, w3: AsyncWeb3, chain: str, pools: List[str], sender: str = ZERO_ADDRESS):
+        sender = w3.to_checksum_address(sender)
+
+        contracts = {
+            pool: w3.eth.contract(address=w3.to_checksum_address(pool), abi=SYNCSWAP_CLASSIC_POOL_DATA_ABI.load())
+            for pool in pools
+        }
+
+        unknown = [pool for pool in pools if pool not in self.states]
+
+        if unknown:
+            tokens = await multicall(
+                w3, chain, [call for pool in unknown for call in (
+                    contracts[pool].functions.token0(), contracts[pool].functions.token1()
+                )]
+            )
+        else:
+            tokens = []
+
+        assets = {pool: (state.token0, state.token1) for pool, state in self.states.items() if pool in contracts}
+        assets.update({pool: (tokens[index * 2], tokens[index * 2 + 1]) for index, pool in enumerate(unknown)})
+
+        calls = []
+
+        for pool in pools:
+            token0, token1 = assets[pool]
+            calls.extend([
+                contracts[pool].functions.getReserves(),
+                contracts[pool].functions.getSwapFee(sender, token0, token1, b""),
+                contracts[pool].functions.getSwapFee(sender, token1, token0, b""),
+            ])
+
+        results = await multicall(w3, chain, calls)
+        now = time.monotonic()
+
+        for index, pool in enumerate(pools):
+            reserves, fee0, fee1 = results[index * 3:index * 3 + 3]
+
+            if reserves is None or fee0 is None or fee1 is None:
+                self.states.pop(pool, None)
+                self.fees.pop((pool, sender.lower()), None)
+                continue
+
+            self.states[pool] = PoolState(*assets[pool], reserves[0], reserves[1], now)
+            self.fees[(pool, sender.lower())] = SwapFees(fee0, fee1, now)
+
+    async def get(self, w3: AsyncWeb3, chain: str, pool: str, sender: str = ZERO_ADDRESS) -> Tuple[PoolState, SwapFees]:
+        if not self.is_fresh(pool, sender):
+            async with self.lock:
+                # Another caller may have refreshed the pool while we waited
+                if not self.is_fresh(pool, sender):
+                    await self.refresh(w3, chain, [pool], sender)
+
+        if pool not in self.states or (pool, sender.lower()) not in self.fees:
+            raise ValueError(f"Can't read reserves of pool {pool}")
+
+        return self.states[pool], self.fees[(pool, sender.lower())]
+
+    async def quote(
+            self,
+            w3: AsyncWeb3,
+            chain: str,
+            pool: str,
+            token_in: str,
+            amounts_in: Sequence[int],
+            sender: str = ZERO_ADDRESS
+    ) -> List[int]:
+        """Output amounts for a swap sent by sender, the fee is the one getAmountOut charges that sender"""
+        state, fees = await self.get(w3, chain, pool, sender)
+
+        if token_in.lower() == state.token0.lower():
+            return get_amounts_out(amounts_in, state.reserve0, state.reserve1, fees.fee0)
+        if token_in.lower() == state.token1.lower():
+            return get_amounts_out(amounts_in, state.reserve1, state.reserve0, fees.fee1)
+
+        raise ValueError(f"Token {token_in} is not in pool {pool}")
+
+
+reserves_cache = ReservesCache()
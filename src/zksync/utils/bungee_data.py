@@ -1,12 +1,9 @@
-import aiohttp
+from . import aggregator_client
 
 
 async def get_bungee_data():
-    async with aiohttp.ClientSession() as session:
-        url = "https://refuel.socket.tech/chains"
-        response = await session.get(url)
-        response_data = await response.json()
-        if response.status == 200:
-            data = response_data["result"]
-            return data
-        return False
+    url = "https://refuel.socket.tech/chains"
+
+    response_data = await aggregator_client.request("bungee", "GET", url, cache_key=("bungee", "chains"), ttl=60)
+
+    return response_data["result"]
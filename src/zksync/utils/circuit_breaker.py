@@ -0,0 +1,37 @@
+import time
+from typing import Dict
+
+from ..settings import CIRCUIT_FAILURES, CIRCUIT_OPEN_TIME
+
+
+class CircuitBreaker:
+    """Opens after CIRCUIT_FAILURES failures in a row and rejects calls for CIRCUIT_OPEN_TIME seconds"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.failures = 0
+        self.open_until = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self.open_until > time.monotonic()
+
+    def success(self):
+        self.failures = 0
+
+    def failure(self):
+        self.failures += 1
+
+        if self.failures >= CIRCUIT_FAILURES:
+            self.open_until = time.monotonic() + CIRCUIT_OPEN_TIME
+            self.failures = 0
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name)
+
+    return _breakers[name]
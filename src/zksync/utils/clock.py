@@ -0,0 +1,82 @@
+import asyncio
+import heapq
+import itertools
+from typing import List, Tuple
+
+
+class Clock:
+    """Real time, every sleep is a single cancellable event loop timer"""
+
+    def time(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    async def sleep(self, delay: float):
+        await asyncio.sleep(delay)
+
+
+class VirtualClock(Clock):
+    """
+    Simulated time for tests and benchmarks.
+    Sleeps wait on timers that only fire when the clock is advanced, either by hand with advance()
+    or by running auto_advance() as a task, which jumps straight to the next timer once the loop is idle.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+        self.timers: List[Tuple[float, int, asyncio.Future]] = []
+        self.counter = itertools.count()
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float):
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.timers, (self.now + delay, next(self.counter), future))
+
+        await future
+
+    def drop_cancelled(self):
+        while self.timers and self.timers[0][2].done():
+            heapq.heappop(self.timers)
+
+    def advance(self, seconds: float):
+        target = self.now + seconds
+
+        while self.timers and self.timers[0][0] <= target:
+            deadline, _, future = heapq.heappop(self.timers)
+            self.now = max(self.now, deadline)
+
+            if not future.done():
+                future.set_result(None)
+
+        self.now = target
+
+    async def auto_advance(self, idle_ticks: int = 10):
+        while True:
+            # Let woken tasks run until they block again before moving time forward
+            for _ in range(idle_ticks):
+                await asyncio.sleep(0)
+
+            self.drop_cancelled()
+
+            if self.timers:
+                self.advance(self.timers[0][0] - self.now)
+            else:
+                await asyncio.sleep(0.001)
+
+
+_clock: Clock = Clock()
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def set_clock(clock: Clock):
+    global _clock
+
+    _clock = clock
@@ -0,0 +1,82 @@
+import time
+from collections import deque
+from typing import Dict, List
+
+from ..config import RPC
+from ..settings import RPC_DOWN_ERRORS, RPC_DOWN_TIME, RPC_HEDGE_MIN_DELAY
+
+EWMA_ALPHA = 0.2
+
+
+class Endpoint:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.errors_in_row = 0
+        self.down_until = 0.0
+        self.samples = deque(maxlen=100)
+
+    @property
+    def is_down(self) -> bool:
+        return self.down_until > time.monotonic()
+
+    @property
+    def score(self) -> float:
+        # Endpoints without samples score 0, so each one gets tried early
+        return self.latency * (1 + 10 * self.error_rate)
+
+    def p95(self) -> float:
+        if not self.samples:
+            return 0.0
+
+        samples = sorted(self.samples)
+
+        return samples[int(len(samples) * 0.95) - 1 if len(samples) > 1 else 0]
+
+
+class EndpointPool:
+    """RPC endpoints of one chain ranked by EWMA latency and error rate"""
+
+    def __init__(self, urls: List[str]) -> None:
+        self.endpoints = [Endpoint(url) for url in urls]
+
+    def ranked(self) -> List[Endpoint]:
+        up = sorted((endpoint for endpoint in self.endpoints if not endpoint.is_down), key=lambda e: e.score)
+        down = sorted((endpoint for endpoint in self.endpoints if endpoint.is_down), key=lambda e: e.down_until)
+
+        return up + down
+
+    def record(self, endpoint: Endpoint, latency: float, ok: bool):
+        endpoint.latency = latency if not endpoint.samples else (
+            EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * endpoint.latency
+        )
+        endpoint.error_rate = EWMA_ALPHA * (0 if ok else 1) + (1 - EWMA_ALPHA) * endpoint.error_rate
+
+        if ok:
+            endpoint.samples.append(latency)
+            endpoint.errors_in_row = 0
+            return
+
+        endpoint.errors_in_row += 1
+
+        if endpoint.errors_in_row >= RPC_DOWN_ERRORS:
+            endpoint.down_until = time.monotonic() + RPC_DOWN_TIME
+
+    def hedge_delay(self, endpoint: Endpoint) -> float:
+        return max(endpoint.p95(), RPC_HEDGE_MIN_DELAY)
+
+
+_pools: Dict[str, EndpointPool] = {}
+
+
+def get_endpoint_pool(chain: str) -> EndpointPool:
+    if chain not in _pools:
+        _pools[chain] = EndpointPool(RPC[chain]["rpc"])
+
+    return _pools[chain]
+
+
+def set_endpoint_pool(chain: str, urls: List[str]):
+    """Point a chain at other endpoints, e.g. a local node, before its providers are created"""
+    _pools[chain] = EndpointPool(urls)
@@ -1,23 +1,20 @@
 import asyncio
-import time
-import random
+from functools import wraps
+from typing import Dict, Union
 
-from web3 import Web3
-from web3.eth import AsyncEth
+from web3 import AsyncWeb3
 
-from ..config import RPC
-from ..settings import CHECK_GWEI, MAX_GWEI
-from ..utils.sleeping import sleep
+from ..settings import CHECK_GWEI, MAX_GWEI, GAS_CHECK_INTERVAL, GAS_RELEASE_BATCH, GAS_RELEASE_INTERVAL
+from ..utils.clock import get_clock
+from ..utils.providers import get_provider
+from ..utils.tracing import span
 
 from loguru import logger
 
 
-async def get_gas():
+async def get_gas(chain: str = "ethereum"):
     try:
-        w3 = Web3(
-            Web3.AsyncHTTPProvider(random.choice(RPC["ethereum"]["rpc"])),
-            modules={"eth": (AsyncEth,)},
-        )
+        w3 = AsyncWeb3(get_provider(chain))
         gas_price = await w3.eth.gas_price
         gwei = w3.from_wei(gas_price, 'gwei')
         return gwei
@@ -25,23 +22,89 @@ async def get_gas():
         logger.error(error)
 
 
-async def wait_gas():
+class GasOracle:
+    """
+    One sampler per chain instead of one polling loop per job.
+    Jobs wait on a shared condition and are released GAS_RELEASE_BATCH at a time
+    every GAS_RELEASE_INTERVAL seconds while gwei stays under MAX_GWEI.
+    """
+
+    def __init__(self, chain: str) -> None:
+        self.chain = chain
+        self.gwei = None
+        self.updated_at = float("-inf")
+        self.waiting = 0
+        self.condition = asyncio.Condition()
+        self.lock = asyncio.Lock()
+        self.task: Union[None, asyncio.Task] = None
+
+    @property
+    def is_normal(self) -> bool:
+        return self.gwei is not None and self.gwei <= MAX_GWEI
+
+    async def sample(self, max_age: float = 0):
+        async with self.lock:
+            if get_clock().time() - self.updated_at < max_age:
+                return
+
+            gwei = await get_gas(self.chain)
+
+            if gwei is not None:
+                self.gwei = gwei
+                self.updated_at = get_clock().time()
+
+    async def run(self):
+        while self.waiting:
+            await self.sample()
+
+            if self.is_normal:
+                logger.success(f"GWEI is normal | current: {self.gwei} < {MAX_GWEI} | waiting jobs: {self.waiting}")
+
+                async with self.condition:
+                    self.condition.notify(GAS_RELEASE_BATCH)
+
+                await get_clock().sleep(GAS_RELEASE_INTERVAL)
+            else:
+                logger.info(f'Current GWEI: {self.gwei} > {MAX_GWEI} | waiting jobs: {self.waiting}')
+                await get_clock().sleep(GAS_CHECK_INTERVAL)
+
+    async def wait(self):
+        if not self.waiting:
+            await self.sample(max_age=GAS_CHECK_INTERVAL)
+
+            if self.is_normal:
+                return
+
+        self.waiting += 1
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+        try:
+            async with self.condition:
+                await self.condition.wait()
+        finally:
+            self.waiting -= 1
+
+
+_oracles: Dict[str, GasOracle] = {}
+
+
+async def wait_gas(chain: str = "ethereum"):
     logger.info("Get GWEI")
-    while True:
-        gas = await get_gas()
 
-        if gas > MAX_GWEI:
-            logger.info(f'Current GWEI: {gas} > {MAX_GWEI}')
-            await sleep(60, 90)
-        else:
-            logger.success(f"GWEI is normal | current: {gas} < {MAX_GWEI}")
-            break
+    if chain not in _oracles:
+        _oracles[chain] = GasOracle(chain)
+
+    await _oracles[chain].wait()
 
 
 def check_gas(func):
+    @wraps(func)
     async def _wrapper(*args, **kwargs):
         if CHECK_GWEI:
-            await wait_gas()
+            with span("check_gas"):
+                await wait_gas()
         return await func(*args, **kwargs)
 
     return _wrapper
@@ -0,0 +1,93 @@
+from collections import deque
+from typing import Deque, Dict, Tuple, Union
+
+from loguru import logger
+
+from ..settings import (
+    GAS_MODEL_MIN_SAMPLES,
+    GAS_MODEL_SAMPLES,
+    GAS_MODEL_PERCENTILE,
+    GAS_MODEL_MARGIN,
+    GAS_MODEL_MAX_SPREAD
+)
+
+GasKey = Tuple[str, str, str, Tuple[str, ...], bool]
+
+# A calldata word holding an address has 12 zero bytes on the left and is far above any token amount
+ADDRESS_MIN = 2 ** 140
+ADDRESS_MAX = 2 ** 160
+
+
+def get_gas_key(chain: str, transaction: dict) -> GasKey:
+    """(chain, contract, selector, token path, sends value) of a transaction"""
+    data = transaction.get("data") or "0x"
+    data = data.hex() if isinstance(data, bytes) else data
+    data = data[2:] if data.startswith("0x") else data
+
+    sender = transaction.get("from", "").lower()[2:]
+    path = []
+
+    for offset in range(8, len(data) - 63, 64):
+        word = data[offset:offset + 64]
+
+        if ADDRESS_MIN <= int(word, 16) < ADDRESS_MAX and word[24:] != sender:
+            path.append("0x" + word[24:])
+
+    return (
+        chain,
+        str(transaction.get("to", "")).lower(),
+        data[:8],
+        tuple(path),
+        bool(transaction.get("value")),
+    )
+
+
+class GasModel:
+    """
+    Gas limits learned from estimated limits that confirmed successfully.
+    zkSync reports gasUsed after the refund, so it can't size a limit, the estimate can.
+    Once a call shape has enough consistent samples its limit is served from a high percentile,
+    unseen shapes and shapes with a wide spread keep using eth_estimateGas.
+    """
+
+    def __init__(self) -> None:
+        self.samples: Dict[GasKey, Deque[int]] = {}
+        self.sent: Dict[str, Tuple[GasKey, int, bool]] = {}
+
+    def limit(self, key: GasKey) -> Union[None, int]:
+        samples = self.samples.get(key)
+
+        if not samples or len(samples) < GAS_MODEL_MIN_SAMPLES:
+            return None
+
+        samples = sorted(samples)
+
+        if samples[-1] > samples[0] * GAS_MODEL_MAX_SPREAD:
+            return None
+
+        gas = samples[min(int(len(samples) * GAS_MODEL_PERCENTILE), len(samples) - 1)]
+
+        return int(gas * (1 + GAS_MODEL_MARGIN))
+
+    def track(self, tx_hash: str, key: GasKey, gas: int, estimated: bool):
+        self.sent[tx_hash] = (key, gas, estimated)
+
+    def record(self, tx_hash: str, receipt: dict):
+        key, gas, estimated = self.sent.pop(tx_hash, (None, None, False))
+
+        if key is None:
+            return
+
+        if receipt.get("status") == 1:
+            # Served limits are not samples, the model would only learn its own output
+            if estimated:
+                self.samples.setdefault(key, deque(maxlen=GAS_MODEL_SAMPLES)).append(gas)
+        elif self.samples.pop(key, None) is not None:
+            # zkSync doesn't report out of gas as gasUsed >= gas, so any failure sends the shape back to estimation
+            logger.warning(f"Failed tx on {key[1]} {key[2]} with gas {gas}, dropping learned limit")
+
+    def forget(self, tx_hash: str):
+        self.sent.pop(tx_hash, None)
+
+
+gas_model = GasModel()
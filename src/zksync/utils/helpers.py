@@ -1,22 +1,36 @@
+from functools import wraps
+
 from loguru import logger
 from ..settings import RETRY_COUNT
-from ..utils.sleeping import sleep
+from .clock import get_clock
+from .metrics import RETRIES
+from .retry_policy import backoff_delay, classify, is_retryable
 
 
 def retry(func):
+    """
+    Run func up to RETRY_COUNT times.
+    Only error kinds from RETRY_ON are retried, with jittered exponential backoff,
+    reverts and business errors are raised right away.
+    """
+    @wraps(func)
     async def wrapper(*args, **kwargs):
-        retries = 0
-        while retries <= RETRY_COUNT:
+        for attempt in range(1, RETRY_COUNT + 1):
             try:
-                result = await func(*args, **kwargs)
-                return result
+                return await func(*args, **kwargs)
             except Exception as e:
-                logger.error(f"Error | {e}")
-                await sleep(10, 20)
-                retries += 1
-            
-                if retries == RETRY_COUNT:
-                    raise e
+                kind = classify(e)
+
+                logger.error(f"Error | {kind} | {e}")
+
+                if attempt == RETRY_COUNT or not is_retryable(e):
+                    raise
+
+                delay = backoff_delay(attempt, e)
+                RETRIES.labels(func.__name__, kind).inc()
+
+                logger.info(f"Retry {attempt}/{RETRY_COUNT - 1} of {func.__name__} in {delay:.1f} s.")
+                await get_clock().sleep(delay)
     return wrapper
 
 
@@ -0,0 +1,37 @@
+from typing import Tuple
+from urllib.parse import urlsplit
+
+from prometheus_client import Counter, Histogram
+
+RPC_REQUESTS = Counter(
+    "rpc_requests_total",
+    "JSON-RPC requests by method, endpoint host and outcome: ok, rpc_error (error reply) or error (transport)",
+    ["method", "endpoint", "status"]
+)
+
+RPC_LATENCY = Histogram(
+    "rpc_request_duration_seconds",
+    "JSON-RPC request latency by method and endpoint host",
+    ["method", "endpoint"]
+)
+
+AGGREGATOR_LATENCY = Histogram(
+    "aggregator_request_duration_seconds",
+    "Aggregator and bridge API latency by api and HTTP status",
+    ["api", "status"]
+)
+
+RETRIES = Counter(
+    "retries_total",
+    "Attempts repeated by helpers.retry by function and error kind",
+    ["function", "kind"]
+)
+
+
+def observe_rpc(url: str, methods: Tuple[str, ...], latency: float, status: str):
+    # Only the host is exported, RPC urls often carry an api key in the path
+    endpoint = urlsplit(url).hostname or "unknown"
+    method = methods[0] if len(set(methods)) == 1 else "batch"
+
+    RPC_REQUESTS.labels(method, endpoint, status).inc()
+    RPC_LATENCY.labels(method, endpoint).observe(latency)
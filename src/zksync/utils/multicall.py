@@ -0,0 +1,31 @@
+from web3 import AsyncWeb3
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+
+from ..config import MULTICALL_ABI, MULTICALL_CONTRACTS
+
+
+async def multicall(w3: AsyncWeb3, chain: str, calls: list) -> list:
+    """Run contract function calls in one Multicall3 request, failed calls return None"""
+    multicall_contract = w3.eth.contract(
+        address=w3.to_checksum_address(MULTICALL_CONTRACTS.get(chain, MULTICALL_CONTRACTS["default"])),
+        abi=MULTICALL_ABI.load()
+    )
+
+    results = await multicall_contract.functions.aggregate3(
+        [(call.address, True, call._encode_transaction_data()) for call in calls]
+    ).call()
+
+    decoded = []
+
+    for call, (success, return_data) in zip(calls, results):
+        if not success:
+            decoded.append(None)
+            continue
+
+        output_types = get_abi_output_types(call.abi)
+        # Same normalizers as ContractFunction.call(), addresses come back checksummed
+        values = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, w3.codec.decode(output_types, return_data))
+        decoded.append(values[0] if len(values) == 1 else values)
+
+    return decoded
@@ -0,0 +1,72 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, Set, Tuple
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+
+class NonceManager:
+    """
+    Hands out nonces per (chain, address) without asking the node for every transaction.
+    While a wallet has transactions in flight the next nonce is reserved locally,
+    once nothing is pending it is synced again from the `pending` block tag.
+    A synced nonce stays fresh until the next reservation, so a sync batched into
+    get_tx_params serves the sign() that follows it.
+    """
+
+    def __init__(self) -> None:
+        self.next_nonce: Dict[Tuple[str, str], int] = {}
+        self.pending: Dict[Tuple[str, str], Set[int]] = defaultdict(set)
+        self.locks: Dict[Tuple[str, str], asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.sent: Dict[str, Tuple[Tuple[str, str], int]] = {}
+        self.fresh: Set[Tuple[str, str]] = set()
+
+    def lock(self, chain: str, address: str) -> asyncio.Lock:
+        return self.locks[(chain, address)]
+
+    def need_sync(self, chain: str, address: str) -> bool:
+        key = (chain, address)
+
+        return key not in self.next_nonce or not (self.pending[key] or key in self.fresh)
+
+    def sync(self, chain: str, address: str, nonce: int):
+        self.next_nonce[(chain, address)] = nonce
+        self.fresh.add((chain, address))
+
+    def reserve(self, chain: str, address: str) -> int:
+        key = (chain, address)
+
+        nonce = self.next_nonce[key]
+        self.next_nonce[key] = nonce + 1
+        self.pending[key].add(nonce)
+        self.fresh.discard(key)
+
+        return nonce
+
+    def track(self, tx_hash: str, chain: str, address: str, nonce: int):
+        self.sent[tx_hash] = ((chain, address), nonce)
+
+    def confirm(self, tx_hash: str):
+        key, nonce = self.sent.pop(tx_hash, (None, None))
+
+        if key is not None:
+            self.pending[key].discard(nonce)
+
+    async def resync(self, w3: AsyncWeb3, chain: str, address: str):
+        key = (chain, address)
+
+        async with self.lock(chain, address):
+            nonce = await w3.eth.get_transaction_count(address, "pending")
+
+            logger.warning(f"[{address}] Resync nonce on {chain} | {self.next_nonce.get(key)} -> {nonce}")
+
+            self.next_nonce[key] = nonce
+            self.fresh.add(key)
+            self.pending[key] = {pending for pending in self.pending[key] if pending < nonce}
+            self.sent = {
+                tx_hash: sent for tx_hash, sent in self.sent.items() if sent[0] != key or sent[1] < nonce
+            }
+
+
+nonce_manager = NonceManager()
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+from itertools import combinations
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Tuple, Union
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from ..config import (
+    BASE_PATH,
+    ZERO_ADDRESS,
+    ZKSYNC_TOKENS,
+    SYNCSWAP_CONTRACTS,
+    SYNCSWAP_CLASSIC_POOL_ABI,
+    PANCAKE_CONTRACTS,
+    PANCAKE_FACTORY_ABI
+)
+from .multicall import multicall
+from .providers import get_provider
+
+POOLS_PATH = BASE_PATH / "data" / "pools.json"
+
+PANCAKE_POOL_FEE = 500
+
+# Seconds, pools discovered within this window are written to the file at once
+SAVE_DELAY = 5
+
+
+def pool_key(dex: str, token_a: str, token_b: str, fee: Union[None, int] = None) -> str:
+    # Both factories return the same pool for (a, b) and (b, a)
+    token_a, token_b = sorted((token_a.lower(), token_b.lower()))
+
+    return f"{dex}:{token_a}:{token_b}:{fee or ''}"
+
+
+class PoolRegistry:
+    """
+    Pool addresses by (dex, token pair, fee), loaded from and saved to a JSON file.
+    A deployed pool never moves, so an address is resolved on chain once and then served from here.
+    Missing pools (zero address) are not stored, they may be deployed later.
+    Several workers share the file: a save merges what is already there and replaces the file
+    atomically, new pools are saved in batches SAVE_DELAY seconds after the first discovery.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.pools: Union[None, Dict[str, str]] = None
+        self.dirty = False
+        self.save_task: Union[None, asyncio.Task] = None
+
+    def read(self) -> Dict[str, str]:
+        try:
+            with open(self.path, "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def load(self) -> Dict[str, str]:
+        if self.pools is None:
+            self.pools = self.read()
+
+        return self.pools
+
+    def save(self, pools: Dict[str, str] = None):
+        pools = {**self.read(), **(self.load() if pools is None else pools)}
+        tmp_path = Path(self.path).with_name(f"{Path(self.path).name}.{os.getpid()}.tmp")
+
+        with open(tmp_path, "w") as file:
+            json.dump(pools, file, indent=2, sort_keys=True)
+
+        os.replace(tmp_path, self.path)
+
+    def schedule_save(self):
+        if self.save_task is not None and not self.save_task.done():
+            return
+
+        try:
+            self.save_task = asyncio.get_running_loop().create_task(self.save_later(SAVE_DELAY))
+        except RuntimeError:
+            self.dirty = False
+            self.save()
+
+    async def save_later(self, delay: float):
+        await asyncio.sleep(delay)
+        await self.flush()
+
+    async def flush(self):
+        if not self.dirty:
+            return
+
+        # The thread writes a snapshot, the dict keeps changing on the event loop
+        self.dirty = False
+
+        try:
+            await asyncio.to_thread(self.save, dict(self.load()))
+        except OSError as e:
+            logger.error(f"Pool registry save error | {e}")
+            self.dirty = True
+
+    def get(self, key: str) -> Union[None, str]:
+        return self.load().get(key)
+
+    def set(self, key: str, address: str, save: bool = True):
+        if address == ZERO_ADDRESS:
+            return
+
+        self.load()[key] = address
+        self.dirty = True
+
+        if save:
+            self.schedule_save()
+
+    async def resolve(self, key: str, loader: Callable[[], Awaitable[str]]) -> str:
+        address = self.get(key)
+
+        if address is None:
+            address = await loader()
+            self.set(key, address)
+
+        return address
+
+    async def warm(self, chain: str = "zksync"):
+        """Resolve every ZKSYNC_TOKENS pair on SyncSwap and Pancake in one multicall"""
+        w3 = AsyncWeb3(get_provider(chain))
+
+        syncswap_factory = w3.eth.contract(
+            address=w3.to_checksum_address(SYNCSWAP_CONTRACTS["classic_pool"]),
+            abi=SYNCSWAP_CLASSIC_POOL_ABI.load()
+        )
+        pancake_factory = w3.eth.contract(
+            address=w3.to_checksum_address(PANCAKE_CONTRACTS["factory"]),
+            abi=PANCAKE_FACTORY_ABI.load()
+        )
+
+        pairs = list(combinations(sorted({w3.to_checksum_address(token) for token in ZKSYNC_TOKENS.values()}), 2))
+
+        keys: List[str] = []
+        calls: List[Tuple] = []
+
+        for token_a, token_b in pairs:
+            if pool_key("syncswap", token_a, token_b) not in self.load():
+                keys.append(pool_key("syncswap", token_a, token_b))
+                calls.append(syncswap_factory.functions.getPool(token_a, token_b))
+            if pool_key("pancake", token_a, token_b, PANCAKE_POOL_FEE) not in self.load():
+                keys.append(pool_key("pancake", token_a, token_b, PANCAKE_POOL_FEE))
+                calls.append(pancake_factory.functions.getPool(token_a, token_b, PANCAKE_POOL_FEE))
+
+        if not calls:
+            return
+
+        try:
+            results = await multicall(w3, chain, calls)
+        except Exception as e:
+            logger.error(f"Pool registry warm up error | {e}")
+            return
+
+        for key, address in zip(keys, results):
+            if address is not None:
+                self.set(key, address, save=False)
+
+        await self.flush()
+
+        logger.info(f"Pool registry warmed | {len(self.load())} pools known")
+
+
+pool_registry = PoolRegistry(POOLS_PATH)
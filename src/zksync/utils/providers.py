@@ -0,0 +1,197 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Tuple, Union
+
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+from web3 import AsyncHTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from ..settings import (
+    RPC_POOL_LIMIT,
+    RPC_POOL_LIMIT_PER_HOST,
+    RPC_KEEPALIVE_TIMEOUT,
+    RPC_TIMEOUT,
+    RPC_HEDGE,
+    RPC_FAILOVER
+)
+from .endpoint_pool import Endpoint, EndpointPool, get_endpoint_pool
+from .metrics import observe_rpc
+
+# Reads that are safe to send to two endpoints at once
+HEDGED_METHODS = {
+    "eth_call",
+    "eth_chainId",
+    "eth_gasPrice",
+    "eth_blockNumber",
+    "eth_getBalance",
+    "eth_getTransactionCount",
+    "eth_getTransactionReceipt",
+    "eth_estimateGas",
+}
+
+# Filters live on the node that created them
+STICKY_METHODS = {"eth_newBlockFilter", "eth_getFilterChanges", "eth_uninstallFilter"}
+
+_session: Union[None, ClientSession] = None
+
+_providers: Dict[Tuple[str, Union[None, str], Union[None, str]], "PooledHTTPProvider"] = {}
+
+
+async def get_session() -> ClientSession:
+    global _session
+
+    if _session is None or _session.closed:
+        connector = TCPConnector(
+            limit=RPC_POOL_LIMIT,
+            limit_per_host=RPC_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=RPC_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300,
+        )
+        _session = ClientSession(connector=connector, timeout=ClientTimeout(total=RPC_TIMEOUT))
+
+    return _session
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that sends every request through the shared keep-alive session.
+    Each call goes to the healthiest endpoint of the pool and fails over to the next one,
+    idempotent reads are hedged to a second endpoint when the first is slower than its p95.
+    """
+
+    def __init__(self, endpoint_uri: str = None, request_kwargs: Any = None, pool: EndpointPool = None) -> None:
+        self.pool = pool or EndpointPool([endpoint_uri])
+        self.sticky: Union[None, Endpoint] = None
+
+        super().__init__(endpoint_uri or self.pool.endpoints[0].url, request_kwargs)
+
+    async def send(self, endpoint: Endpoint, data: bytes, methods: Tuple[str, ...] = ()) -> Any:
+        """Decoded JSON-RPC response, a single reply or the list of a batch"""
+        session = await get_session()
+        start = time.perf_counter()
+
+        try:
+            async with session.post(endpoint.url, data=data, **dict(self.get_request_kwargs())) as response:
+                response.raise_for_status()
+                raw_response = await response.read()
+
+            decoded = self.decode_rpc_response(raw_response)
+        except (ClientError, asyncio.TimeoutError, ValueError):
+            self.pool.record(endpoint, time.perf_counter() - start, False)
+            observe_rpc(endpoint.url, methods, time.perf_counter() - start, "error")
+            raise
+
+        # An error reply comes from a healthy node (revert, nonce too low), only the metric tells it apart
+        replies = decoded if isinstance(decoded, list) else [decoded]
+        status = "rpc_error" if any("error" in reply for reply in replies) else "ok"
+
+        self.pool.record(endpoint, time.perf_counter() - start, True)
+        observe_rpc(endpoint.url, methods, time.perf_counter() - start, status)
+
+        return decoded
+
+    async def hedged_send(self, first: Endpoint, second: Endpoint, data: bytes, methods: Tuple[str, ...]) -> Any:
+        primary = asyncio.create_task(self.send(first, data, methods))
+
+        done, _ = await asyncio.wait({primary}, timeout=self.pool.hedge_delay(first))
+
+        if done:
+            if primary.exception() is None:
+                return primary.result()
+            return await self.send(second, data, methods)
+
+        tasks = {primary, asyncio.create_task(self.send(second, data, methods))}
+        error = None
+
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def post(self, data: bytes, methods: Tuple[str, ...] = ()) -> Any:
+        if STICKY_METHODS.intersection(methods):
+            if self.sticky is None or self.sticky.is_down:
+                self.sticky = self.pool.ranked()[0]
+            return await self.send(self.sticky, data, methods)
+
+        endpoints = self.pool.ranked()[:RPC_FAILOVER]
+        error = None
+
+        if RPC_HEDGE and len(endpoints) > 1 and methods and HEDGED_METHODS.issuperset(methods):
+            try:
+                return await self.hedged_send(endpoints[0], endpoints[1], data, methods)
+            except (ClientError, asyncio.TimeoutError) as e:
+                error = e
+                endpoints = endpoints[2:]
+
+        for endpoint in endpoints:
+            try:
+                return await self.send(endpoint, data, methods)
+            except (ClientError, asyncio.TimeoutError) as e:
+                error = e
+
+        raise error
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        request_data = self.encode_rpc_request(method, params)
+
+        return await self.post(request_data, (method,))
+
+    async def make_batch_request(self, requests: List[Tuple[RPCEndpoint, Any]], raise_errors: bool = True) -> List[Any]:
+        """Results in request order, with raise_errors=False a failed item is returned as its ValueError"""
+        batch = [
+            {"jsonrpc": "2.0", "method": method, "params": params, "id": next(self.request_counter)}
+            for method, params in requests
+        ]
+
+        response = await self.post(json.dumps(batch).encode(), tuple(method for method, _ in requests))
+        response = sorted(response, key=lambda item: item["id"])
+
+        if raise_errors:
+            errors = [item["error"] for item in response if "error" in item]
+
+            if errors:
+                raise ValueError(errors[0])
+
+        return [ValueError(item["error"]) if "error" in item else item["result"] for item in response]
+
+
+def get_provider(chain: str, proxy: Union[None, str] = None, rpc: Union[None, str] = None) -> PooledHTTPProvider:
+    """Shared provider for the chain, pass rpc to pin a single endpoint instead of the chain pool"""
+    key = (chain, rpc, proxy)
+
+    provider = _providers.get(key)
+
+    if provider is None:
+        request_kwargs = {}
+
+        if proxy:
+            request_kwargs = {"proxy": f"http://{proxy}"}
+
+        pool = EndpointPool([rpc]) if rpc else get_endpoint_pool(chain)
+
+        provider = PooledHTTPProvider(request_kwargs=request_kwargs, pool=pool)
+        _providers[key] = provider
+
+    return provider
+
+
+async def close_providers():
+    global _session
+
+    _providers.clear()
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+
+    _session = None
@@ -0,0 +1,125 @@
+import asyncio
+from typing import Dict, Union
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from ..settings import RECEIPT_POLL_MIN, RECEIPT_POLL_MAX
+from .providers import get_provider
+
+# JSON-RPC errors about the request itself, asking again for the same hash can't succeed
+INVALID_REQUEST_CODES = {-32600, -32602}
+
+
+class ReceiptWatcher:
+    """
+    One watcher per chain resolves every pending transaction hash.
+    New blocks come from an eth_newBlockFilter when the node supports it and from
+    eth_blockNumber otherwise, receipts for all hashes are fetched in one batch per block.
+    """
+
+    def __init__(self, w3: AsyncWeb3) -> None:
+        self.w3 = w3
+        self.waiters: Dict[str, asyncio.Future] = {}
+        self.task: Union[None, asyncio.Task] = None
+        self.filter_id: Union[None, str] = None
+        self.use_filter = True
+        self.last_block: Union[None, int] = None
+
+    async def wait(self, tx_hash: str, timeout: float) -> dict:
+        future = self.waiters.get(tx_hash)
+
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.waiters[tx_hash] = future
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        finally:
+            if self.waiters.get(tx_hash) is future and not future.done():
+                self.waiters.pop(tx_hash)
+
+    async def new_block(self) -> bool:
+        if self.use_filter:
+            try:
+                if self.filter_id is None:
+                    response = await self.w3.provider.make_request("eth_newBlockFilter", [])
+                    self.filter_id = response["result"]
+                    return True
+
+                changes = await self.w3.provider.make_request("eth_getFilterChanges", [self.filter_id])
+                return bool(changes["result"])
+            except Exception:
+                if self.filter_id is not None:
+                    # The node dropped an expired filter, create a new one on the next poll
+                    self.filter_id = None
+                    return True
+
+                logger.info("Block filter is not available, polling block number")
+                self.use_filter = False
+
+        block_number = await self.w3.eth.block_number
+
+        if block_number != self.last_block:
+            self.last_block = block_number
+            return True
+        return False
+
+    async def check_receipts(self):
+        hashes = list(self.waiters)
+
+        receipts = await self.w3.provider.make_batch_request(
+            [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in hashes],
+            raise_errors=False
+        )
+
+        for tx_hash, receipt in zip(hashes, receipts):
+            if isinstance(receipt, Exception):
+                # An error fails only the waiter of its own hash, other errors are asked again next block
+                error = receipt.args[0] if receipt.args and isinstance(receipt.args[0], dict) else {}
+
+                if error.get("code") in INVALID_REQUEST_CODES:
+                    future = self.waiters.pop(tx_hash, None)
+
+                    if future is not None and not future.done():
+                        future.set_exception(receipt)
+                else:
+                    logger.warning(f"Receipt of {tx_hash} is not available | {error or receipt}")
+                continue
+
+            if receipt is None or receipt.get("status") is None:
+                continue
+
+            future = self.waiters.pop(tx_hash, None)
+
+            if future is not None and not future.done():
+                future.set_result({**receipt, "status": int(receipt["status"], 16)})
+
+    async def run(self):
+        delay = RECEIPT_POLL_MIN
+
+        while self.waiters:
+            try:
+                if await self.new_block():
+                    await self.check_receipts()
+                    delay = RECEIPT_POLL_MIN
+                else:
+                    delay = min(delay * 2, RECEIPT_POLL_MAX)
+            except Exception as e:
+                logger.error(f"Receipt watcher error | {e}")
+                delay = min(delay * 2, RECEIPT_POLL_MAX)
+
+            await asyncio.sleep(delay)
+
+
+_watchers: Dict[str, ReceiptWatcher] = {}
+
+
+def get_receipt_watcher(chain: str) -> ReceiptWatcher:
+    if chain not in _watchers:
+        _watchers[chain] = ReceiptWatcher(AsyncWeb3(get_provider(chain)))
+
+    return _watchers[chain]
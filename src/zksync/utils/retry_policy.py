@@ -0,0 +1,79 @@
+import asyncio
+import random
+
+from aiohttp import ClientError
+from web3.exceptions import ContractLogicError, TimeExhausted, TransactionNotFound
+
+from ..settings import (
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    RETRY_ON
+)
+from .aggregator_client import AggregatorError
+
+TRANSIENT = "transient"
+NONCE = "nonce"
+UNCONFIRMED = "unconfirmed"
+REVERT = "revert"
+BUSINESS = "business"
+
+NONCE_MESSAGES = ("nonce too low", "nonce too high", "invalid nonce")
+
+# The transaction reached the node and may still be mined, running the action again could execute it twice
+UNCONFIRMED_MESSAGES = ("already known", "replacement transaction")
+
+REVERT_MESSAGES = ("execution reverted", "revert")
+
+TRANSIENT_MESSAGES = (
+    "timeout",
+    "timed out",
+    "too many requests",
+    "rate limit",
+    "header not found",
+    "bad gateway",
+    "service unavailable",
+    "gateway timeout",
+)
+
+
+def classify(error: Exception) -> str:
+    """Sort an error into transient, nonce, unconfirmed, revert or business"""
+    if isinstance(error, AggregatorError):
+        if error.circuit_open:
+            return BUSINESS
+        return TRANSIENT if error.status is None or error.status == 429 or error.status >= 500 else BUSINESS
+
+    # Raised by wait_until_tx_finished after the receipt timeout, the transaction was sent
+    if isinstance(error, (TimeExhausted, TransactionNotFound)):
+        return UNCONFIRMED
+
+    if isinstance(error, (ClientError, asyncio.TimeoutError, ConnectionError)):
+        return TRANSIENT
+
+    if isinstance(error, ContractLogicError):
+        return REVERT
+
+    message = str(error).lower()
+
+    if any(text in message for text in UNCONFIRMED_MESSAGES):
+        return UNCONFIRMED
+    if any(text in message for text in NONCE_MESSAGES):
+        return NONCE
+    if any(text in message for text in REVERT_MESSAGES):
+        return REVERT
+    if any(text in message for text in TRANSIENT_MESSAGES):
+        return TRANSIENT
+
+    return BUSINESS
+
+
+def is_retryable(error: Exception) -> bool:
+    return classify(error) in RETRY_ON
+
+
+def backoff_delay(attempt: int, error: Exception) -> float:
+    # The nonce was already resynced by Account, the next attempt can go right away
+    if classify(error) == NONCE:
+        return random.uniform(0, RETRY_BASE_DELAY)
+
+    return random.uniform(RETRY_BASE_DELAY, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
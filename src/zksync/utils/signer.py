@@ -0,0 +1,48 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Tuple, Union
+
+from eth_account import Account as EthereumAccount
+from eth_account.datastructures import SignedTransaction
+
+from ..settings import SIGNER_POOL, SIGNER_WORKERS
+
+_executor: Union[None, Executor] = None
+
+
+def get_executor() -> Executor:
+    global _executor
+
+    if _executor is None:
+        if SIGNER_POOL == "process":
+            _executor = ProcessPoolExecutor(max_workers=SIGNER_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=SIGNER_WORKERS, thread_name_prefix="signer")
+
+    return _executor
+
+
+def sign_batch(transactions: List[Tuple[dict, str]]) -> List[SignedTransaction]:
+    return [EthereumAccount.sign_transaction(transaction, private_key) for transaction, private_key in transactions]
+
+
+async def sign_transactions(transactions: List[Tuple[dict, str]]) -> List[SignedTransaction]:
+    """Sign (transaction, private_key) pairs in the worker pool, off the event loop"""
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(get_executor(), sign_batch, transactions)
+
+
+async def sign_transaction(transaction: dict, private_key: str) -> SignedTransaction:
+    signed = await sign_transactions([(transaction, private_key)])
+
+    return signed[0]
+
+
+def shutdown_signer():
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+
+    _executor = None
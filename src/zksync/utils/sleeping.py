@@ -1,12 +1,12 @@
-import asyncio
 import random
 
 from loguru import logger
 
+from .clock import get_clock
+
 
 async def sleep(sleep_from: int, sleep_to: int):
     delay = random.randint(sleep_from, sleep_to)
 
     logger.info(f"💤 Sleep {delay} s.")
-    for _ in range(delay):
-        await asyncio.sleep(1)
+    await get_clock().sleep(delay)
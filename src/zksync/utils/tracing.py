@@ -0,0 +1,217 @@
+import asyncio
+import json
+import logging
+import os
+import queue
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, List, Set, Union
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+from loguru import logger
+
+from ..settings import (
+    TRACING,
+    TRACE_FILE,
+    TRACE_FILE_MAX_BYTES,
+    TRACE_FILE_BACKUPS,
+    TRACE_COLLECTOR,
+    TRACE_BATCH_SIZE
+)
+
+SERVICE_NAME = "rebels_main_bot"
+
+_trace_id: ContextVar[Union[None, str]] = ContextVar("trace_id", default=None)
+
+_current: ContextVar[Union[None, "Span"]] = ContextVar("span", default=None)
+
+
+class SpanExporter:
+    """
+    Buffers finished spans and writes them in batches of TRACE_BATCH_SIZE
+    as JSON lines to TRACE_FILE and/or to a Zipkin v2 compatible TRACE_COLLECTOR.
+    Every process writes its own rotated file from a background thread, the event loop
+    only puts the batch on a queue.
+    """
+
+    def __init__(self, path: str, collector: str, batch_size: int) -> None:
+        self.path = path
+        self.collector = collector
+        self.batch_size = batch_size
+        self.buffer: List[Dict[str, Any]] = []
+        self.tasks: Set[asyncio.Task] = set()
+        self.file_logger: Union[None, logging.Logger] = None
+        self.listener: Union[None, QueueListener] = None
+
+    def get_file_logger(self) -> logging.Logger:
+        if self.file_logger is None:
+            # The pid is read on the first write, gunicorn workers import the app after the fork
+            root, ext = os.path.splitext(self.path)
+            handler = RotatingFileHandler(
+                f"{root}.{os.getpid()}{ext}",
+                maxBytes=TRACE_FILE_MAX_BYTES,
+                backupCount=TRACE_FILE_BACKUPS,
+                delay=True
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+
+            records = queue.SimpleQueue()
+            self.listener = QueueListener(records, handler)
+            self.listener.start()
+
+            self.file_logger = logging.getLogger(f"{__name__}.{os.getpid()}")
+            self.file_logger.propagate = False
+            self.file_logger.setLevel(logging.INFO)
+            self.file_logger.handlers = [QueueHandler(records)]
+
+        return self.file_logger
+
+    def export(self, record: Dict[str, Any]):
+        self.buffer.append(record)
+
+        if len(self.buffer) >= self.batch_size:
+            self.flush_nowait()
+
+    def flush_nowait(self):
+        batch, self.buffer = self.buffer, []
+
+        if not batch:
+            return
+
+        if self.path:
+            self.get_file_logger().info("\n".join(json.dumps(record) for record in batch))
+
+        if self.collector:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+
+            task = loop.create_task(self.post(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def post(self, batch: List[Dict[str, Any]]):
+        try:
+            async with ClientSession(timeout=ClientTimeout(total=10)) as session:
+                async with session.post(self.collector, json=batch) as response:
+                    if response.status >= 300:
+                        logger.warning(f"Trace collector answered {response.status}, {len(batch)} spans dropped")
+        except (ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Trace collector is not available, {len(batch)} spans dropped | {e}")
+
+    async def flush(self):
+        self.flush_nowait()
+
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+        if self.listener is not None:
+            # stop() waits until the thread has written everything queued
+            listener, self.listener, self.file_logger = self.listener, None, None
+            await asyncio.to_thread(listener.stop)
+
+            for handler in listener.handlers:
+                handler.close()
+
+
+exporter = SpanExporter(TRACE_FILE, TRACE_COLLECTOR, TRACE_BATCH_SIZE)
+
+
+class Span:
+    """One timed step of the trace, exported in Zipkin v2 format when it ends"""
+
+    def __init__(self, name: str, tags: Dict[str, Any]) -> None:
+        self.name = name
+        self.tags = {key: str(value) for key, value in tags.items() if value is not None}
+        self.id = uuid.uuid4().hex[:16]
+        self.trace_id: Union[None, str] = None
+        self.parent_id: Union[None, str] = None
+        self.start = 0.0
+        self.tokens = []
+
+    def set(self, key: str, value: Any):
+        self.tags[key] = str(value)
+
+    def __enter__(self) -> "Span":
+        parent = _current.get()
+
+        self.trace_id = _trace_id.get()
+
+        if self.trace_id is None:
+            # A span outside of any trace starts its own
+            self.trace_id = uuid.uuid4().hex
+            self.tokens.append((_trace_id, _trace_id.set(self.trace_id)))
+
+        if parent is not None and parent.trace_id == self.trace_id:
+            self.parent_id = parent.id
+
+        self.tokens.append((_current, _current.set(self)))
+        self.start = time.time()
+
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.time() - self.start
+
+        for var, token in reversed(self.tokens):
+            var.reset(token)
+
+        if exc is not None:
+            self.tags["error"] = str(exc)[:300] or exc_type.__name__
+
+        if not TRACING:
+            return False
+
+        record = {
+            "traceId": self.trace_id,
+            "id": self.id,
+            "name": self.name,
+            "timestamp": int(self.start * 1_000_000),
+            "duration": max(int(duration * 1_000_000), 1),
+            "localEndpoint": {"serviceName": SERVICE_NAME},
+            "tags": self.tags,
+        }
+
+        if self.parent_id is not None:
+            record["parentId"] = self.parent_id
+
+        exporter.export(record)
+
+        return False
+
+
+def span(name: str, **tags) -> Span:
+    return Span(name, tags)
+
+
+@contextmanager
+def trace(trace_id: Union[None, str] = None):
+    """Run the block in a trace, the run_bot job_id is used as the correlation id"""
+    trace_token = _trace_id.set(trace_id or uuid.uuid4().hex)
+    span_token = _current.set(None)
+
+    try:
+        yield
+    finally:
+        _current.reset(span_token)
+        _trace_id.reset(trace_token)
+
+
+def traced(name: str = None):
+    """Wrap every call of an async function in a span"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name or func.__name__):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def flush_traces():
+    await exporter.flush()
@@ -0,0 +1,84 @@
+import time
+from typing import Dict, Tuple, Union
+
+from web3 import AsyncWeb3
+
+from ..settings import GAS_PRICE_TTL
+from .nonce_manager import nonce_manager
+
+_chain_ids: Dict[str, int] = {}
+
+_gas_prices: Dict[str, Tuple[float, int]] = {}
+
+
+def get_cached_gas_price(chain: str) -> Union[None, int]:
+    cached = _gas_prices.get(chain)
+
+    if cached is not None and time.monotonic() - cached[0] < GAS_PRICE_TTL:
+        return cached[1]
+
+
+def set_cached_gas_price(chain: str, gas_price: int):
+    _gas_prices[chain] = (time.monotonic(), gas_price)
+
+
+async def get_chain_id(w3: AsyncWeb3, chain: str) -> int:
+    if chain not in _chain_ids:
+        _chain_ids[chain] = await w3.eth.chain_id
+
+    return _chain_ids[chain]
+
+
+async def get_gas_price(w3: AsyncWeb3, chain: str) -> int:
+    gas_price = get_cached_gas_price(chain)
+
+    if gas_price is None:
+        gas_price = await w3.eth.gas_price
+        set_cached_gas_price(chain, gas_price)
+
+    return gas_price
+
+
+async def get_tx_params(w3: AsyncWeb3, chain: str, address: str) -> Tuple[int, int]:
+    """
+    Return chain_id and gas_price in at most one batched round-trip.
+    The nonce is synced in the same batch when needed but only reserved by reserve_nonce at sign time,
+    so a transaction that fails to build never holds one.
+    """
+
+    chain_id = _chain_ids.get(chain)
+    gas_price = get_cached_gas_price(chain)
+
+    async with nonce_manager.lock(chain, address):
+        requests = []
+
+        if gas_price is None:
+            requests.append(("eth_gasPrice", []))
+        if chain_id is None:
+            requests.append(("eth_chainId", []))
+
+        need_sync = nonce_manager.need_sync(chain, address)
+
+        if need_sync:
+            requests.append(("eth_getTransactionCount", [address, "pending"]))
+
+        results = [int(result, 16) for result in await w3.provider.make_batch_request(requests)] if requests else []
+
+        if gas_price is None:
+            gas_price = results.pop(0)
+            set_cached_gas_price(chain, gas_price)
+        if chain_id is None:
+            chain_id = results.pop(0)
+            _chain_ids[chain] = chain_id
+        if need_sync:
+            nonce_manager.sync(chain, address, results.pop(0))
+
+    return chain_id, gas_price
+
+
+async def reserve_nonce(w3: AsyncWeb3, chain: str, address: str) -> int:
+    async with nonce_manager.lock(chain, address):
+        if nonce_manager.need_sync(chain, address):
+            nonce_manager.sync(chain, address, await w3.eth.get_transaction_count(address, "pending"))
+
+        return nonce_manager.reserve(chain, address)